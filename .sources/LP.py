@@ -1,101 +1,97 @@
 from ortools.linear_solver import pywraplp
+import argparse
+import math
+import sys
 import time
-import random   
+import numpy as np
+from instance_io import read_instance, selected_from_mask
+from paper_assignment import time_execution
+from model_builder import MP_STATUS_NAMES, build_linear_model
+from rounding import dependent_rounding, repair_assignment
 
-def time_execution(func):
-    def wrapper(*args, **kwargs):
-        start_time = time.time()
-        result = func(*args, **kwargs)
-        end_time = time.time()
-        execution_time = end_time - start_time
-        print(f"{execution_time:.4f}")
-        return result
-    return wrapper
 
+# Dual simplex (GLOP) is fastest on small models, the first-order PDLP scales to the large
+# sparse ones (GLOP took 500 s on a 750k-edge instance that PDLP solves in 34 s)
+LP_BACKENDS = {'glop': 'GLOP', 'pdlp': 'PDLP', 'scip': 'SCIP'}
+PDLP_MIN_EDGES = 50_000
+
+def choose_lp_backend(num_edges):
+    return 'pdlp' if num_edges >= PDLP_MIN_EDGES else 'glop'
 
 def input_data():
-    with open('input.txt', 'r') as f:
-        num_papers,num_reviewers,reviews_per_paper = map(int, f.readline().strip().split())
-        willing_reviewers = {}
-        for i in range(num_papers):
-            line = list(map(int, f.readline().strip().split()))
-            paper_id = i+1
-            reviewers = line[1:]
-            willing_reviewers[paper_id] = reviewers
-    return num_papers, num_reviewers, reviews_per_paper, willing_reviewers
+    return read_instance('input.txt')
 
-@time_execution
-def main()-> None:
-    num_papers, num_reviewers, reviews_per_paper, willing_reviewers = input_data()  
-    solver=pywraplp.Solver.CreateSolver('SCIP')
+def parse_args():
+    parser = argparse.ArgumentParser(description="LP relaxation + dependent rounding of the paper-reviewer assignment on input.txt.")
+    parser.add_argument('--stats', action='store_true', help="report model build and solve times on stderr")
+    parser.add_argument('--compact', action='store_true',
+                        help="no load variables, one sum <= max_load row per reviewer and bounded max_load")
+    parser.add_argument('--backend', choices=['auto'] + list(LP_BACKENDS), default='auto',
+                        help=f"LP solver, auto picks PDLP from {PDLP_MIN_EDGES} edges on and GLOP below")
+    parser.add_argument('--seed', type=int, default=None, help="seed of the rounding")
+    parser.add_argument('--repair', action='store_true',
+                        help="repair the rounded assignment with augmenting paths down to ceil(LP) per reviewer")
+    return parser.parse_args()
+
+def solve(num_papers, num_reviewers, reviews_per_paper, indptr, indices, backend='auto', compact=False, seed=None,
+          repair=False):
+    # Returns (rounded max_load or None, status name, LP optimum or None, times, selected)
+    # with times the build / solve seconds and the backend used and selected the (P, K)
+    # array of the rounded assignment or None
+    build_start = time.perf_counter()
+    if backend == 'auto':
+        backend = choose_lp_backend(len(indices))
+    solver=pywraplp.Solver.CreateSolver(LP_BACKENDS[backend])
     if not solver:
-        print("Solver not created.")
-        return
-    # Create binary variables for each paper-reviewer pair
-    x = {}
-    for paper in range(1, num_papers + 1):
-        for reviewer in willing_reviewers[paper]:
-            x[(paper, reviewer)] = solver.NumVar(0,1,f'x[{paper},{reviewer}]')
-    loads= {}   
-    for reviewer in range(1, num_reviewers + 1):
-        loads[reviewer] = solver.NumVar(0, num_papers, f'load[{reviewer}]')
-    for j in range(1,num_papers+1):
-        solver.Add(solver.Sum(x[(j,i)] for i in willing_reviewers[j]) == reviews_per_paper)
-    for i in range(1, num_reviewers + 1):
-        solver.Add(loads[i] == solver.Sum(x[(j, i)] for j in range(1, num_papers + 1) if (j, i) in x))
-    max_load = solver.NumVar(0, num_papers, 'max_load')
-    for i in range(1, num_reviewers + 1):
-        solver.Add(loads[i] <= max_load)
-    solver.Minimize(max_load)
+        return None, 'NOT_CREATED', None, {'backend': backend}, None
+    # Continuous variables for each paper-reviewer pair, in CSR edge order
+    x, loads, max_load = build_linear_model(solver, num_papers, num_reviewers, reviews_per_paper, indptr, indices,
+                                            integer=False, compact=compact)
+    build_time = time.perf_counter() - build_start
     
     # Solve the LP model
+    solve_start = time.perf_counter()
     status = solver.Solve()
+    times = {'backend': backend, 'build': build_time, 'solve': time.perf_counter() - solve_start}
     
     # Check if a solution was found
     if status != pywraplp.Solver.OPTIMAL and status != pywraplp.Solver.FEASIBLE:
+        return None, MP_STATUS_NAMES[status], None, times, None
+    
+    # Dependent rounding: exactly reviews_per_paper distinct reviewers per paper, each picked
+    # with its fractional value as probability
+    values = np.array([v.solution_value() for v in x])
+    chosen = dependent_rounding(indptr, values, reviews_per_paper, np.random.default_rng(seed))
+    if repair:
+        # Bring every reviewer back under ceil(LP), the integer optimum. PDLP is only accurate
+        # to its tolerance, a capacity too low is raised by the repair itself
+        capacity = math.ceil(max_load.solution_value() - 1e-3)
+        repaired, _ = repair_assignment(num_reviewers, reviews_per_paper, indptr, indices, chosen, capacity)
+        if repaired is not None:
+            chosen = repaired
+    rounded = int(np.bincount(indices[chosen], minlength=num_reviewers + 1)[1:].max(initial=0))
+    selected = selected_from_mask(num_papers, reviews_per_paper, indices, chosen)
+    return rounded, MP_STATUS_NAMES[status], max_load.solution_value(), times, selected
+
+@time_execution
+def main()-> None:
+    args = parse_args()
+    num_papers, num_reviewers, reviews_per_paper, indptr, indices = input_data()
+    rounded, status, lp_value, times, _ = solve(num_papers, num_reviewers, reviews_per_paper, indptr, indices,
+                                             args.backend, args.compact, args.seed, args.repair)
+    if status == 'NOT_CREATED':
+        print("Solver not created.")
+        return
+    if args.stats:
+        print(f"backend: {times['backend']} build: {times['build']:.4f}s solve: {times['solve']:.4f}s", file=sys.stderr)
+    if lp_value is None:
         print('No solution found.')
         return
         
     # Print the LP solution
-    print(f"LP Solution - Maximum load: {max_load.solution_value()}")
-    
-    # Randomized Rounding
-    assignments = {}
-    reviewer_counts = {r: 0 for r in range(1, num_reviewers + 1)}
-    
-    for paper in range(1, num_papers + 1):
-        # Get the fractional solution values for this paper
-        probabilities = []
-        reviewers = []
-        for reviewer in willing_reviewers[paper]:
-            probabilities.append(x[(paper, reviewer)].solution_value())
-            reviewers.append(reviewer)
-        
-        # Normalize probabilities (they should sum to reviews_per_paper)
-        total = sum(probabilities)
-        if total > 0:
-            probabilities = [p/total for p in probabilities]
-        # Select reviewers without replacement
-        chosen = []
-        for _ in range(reviews_per_paper):
-            if not probabilities:  # In case all probabilities are zero
-                remaining = [r for r in willing_reviewers[paper] if r not in chosen]
-                if not remaining:
-                    break
-                r = random.choice(remaining)
-            else:
-                r = random.choices(reviewers, weights=probabilities, k=1)[0]
-                while r in chosen:
-                    # Resample if we get a duplicate (for cases where we sample with replacement)
-                    r = random.choices(reviewers, weights=probabilities, k=1)[0]
-            
-            chosen.append(r)
-            reviewer_counts[r] += 1
-        
-        assignments[paper] = chosen
-    
+    print(f"LP Solution - Maximum load: {lp_value}")
     # Output the results
-    print(f"{max(reviewer_counts.values())}")
+    print(f"{rounded}")
     
 
 if __name__ == "__main__":
@@ -1,69 +1,92 @@
 from ortools.linear_solver import pywraplp
+import numpy as np
+import argparse
+import sys
 import time
-
-def time_execution(func):
-    def wrapper(*args, **kwargs):
-        start_time = time.time()
-        result = func(*args, **kwargs)
-        end_time = time.time()
-        execution_time = end_time - start_time
-        print(f"{execution_time:.4f}")
-        return result
-    return wrapper
-
-
+from instance_io import load_bounds, read_instance, selected_from_mask
+from paper_assignment import time_execution
+from model_builder import MP_STATUS_NAMES, build_aggregated_linear_model, build_linear_model
+from symmetry import Aggregation, class_counts, expand_assignment
+from warm_start import heuristic_assignment, hint_aggregated_linear_model, hint_linear_model
 
 
 def input_data():
-    with open('input.txt', 'r') as f:
-        num_papers,num_reviewers,reviews_per_paper = map(int, f.readline().strip().split())
-        willing_reviewers = {}
-        for i in range(num_papers):
-            line = list(map(int, f.readline().strip().split()))
-            paper_id = i+1
-            reviewers = line[1:]
-            willing_reviewers[paper_id] = reviewers
-    return num_papers, num_reviewers, reviews_per_paper, willing_reviewers
+    return read_instance('input.txt')
 
-@time_execution
-def main():
-    num_papers, num_reviewers, reviews_per_paper, willing_reviewers = input_data()  
-    solver = pywraplp.Solver.CreateSolver('SCIP')
-    
-    
-    x = {}
-    for paper in range(1, num_papers + 1):
-        for reviewer in willing_reviewers[paper]:
-            x[(paper, reviewer)] = solver.BoolVar(f'x[{paper},{reviewer}]')
+def parse_args():
+    parser = argparse.ArgumentParser(description="SCIP model of the paper-reviewer assignment on input.txt.")
+    parser.add_argument('--stats', action='store_true', help="report model build and solve times on stderr")
+    parser.add_argument('--compact', action='store_true',
+                        help="no load variables, one sum <= max_load row per reviewer and bounded max_load")
+    parser.add_argument('--hint', action='store_true',
+                        help="seed the solver with a greedy + local search assignment and bound max_load by it")
+    parser.add_argument('--aggregate', action='store_true',
+                        help="one integer count per (paper class, reviewer class) of interchangeable papers / reviewers")
+    return parser.parse_args()
 
-    # Ràng buộc: Mỗi paper phải được đánh giá bởi đúng số lượng reviewers
-    for paper in range(1, num_papers + 1):
-        solver.Add(solver.Sum(x[(paper, reviewer)] for reviewer in willing_reviewers[paper]) == reviews_per_paper)
+def solve(num_papers, num_reviewers, reviews_per_paper, indptr, indices, compact=False, hint=False, aggregate=False,
+          time_limit=None):
+    # Returns (max_load or None, status name, {'build', 'hint', 'solve'} seconds, (P, K) array
+    # of the assigned reviewers or None)
+    build_start = time.perf_counter()
+    # Tạo solver: MIP = Mixed Integer Programming
+    solver = pywraplp.Solver.CreateSolver('SCIP')
 
-    # Ràng buộc: Tải của mỗi reviewer
-    loads = {}
-    for reviewer in range(1, num_reviewers + 1):
-        loads[reviewer] = solver.IntVar(0, num_papers, f'load[{reviewer}]')
-        solver.Add(loads[reviewer] == solver.Sum(x[(paper, reviewer)] for paper in range(1, num_papers + 1) if (paper, reviewer) in x))
-    
-    # Ràng buộc: Tải tối đa của các reviewers là nhỏ nhất
-    max_load = solver.IntVar(0, num_papers, 'max_load')
-    for reviewer in range(1, num_reviewers + 1):
-        solver.Add(loads[reviewer] <= max_load)
+    # Ràng buộc: Mỗi paper phải được đánh giá bởi đúng số lượng reviewers,
+    # tải của mỗi reviewer không vượt quá max_load
+    if aggregate:
+        # Gộp các paper / reviewer có cùng danh sách thành lớp tương đương
+        aggregation = Aggregation(num_papers, num_reviewers, indptr, indices)
+        low, high = load_bounds(num_papers, num_reviewers, reviews_per_paper, indices)
+        y, max_load = build_aggregated_linear_model(solver, aggregation, reviews_per_paper, low, high)
+    else:
+        x, loads, max_load = build_linear_model(solver, num_papers, num_reviewers, reviews_per_paper, indptr, indices,
+                                                compact=compact)
+    build_time = time.perf_counter() - build_start
 
-    # Hàm mục tiêu: Tối thiểu hóa tải tối đa
-    solver.Minimize(max_load)
+    # Warm start từ lời giải heuristic
+    hint_time = 0.0
+    if hint:
+        hint_start = time.perf_counter()
+        value, chosen = heuristic_assignment(num_reviewers, reviews_per_paper, indptr, indices)
+        if chosen is not None and aggregate:
+            counts = class_counts(aggregation, indptr, indices, chosen)
+            hint_aggregated_linear_model(solver, y, max_load, value, counts)
+        elif chosen is not None:
+            hint_linear_model(solver, num_reviewers, indices, x, loads, max_load, value, chosen)
+        hint_time = time.perf_counter() - hint_start
 
     # Giải bài toán
+    if time_limit is not None:
+        solver.SetTimeLimit(int(time_limit * 1000))
+    solve_start = time.perf_counter()
     status = solver.Solve()
-    # In kết quả
+    solve_time = time.perf_counter() - solve_start
+    times = {'build': build_time, 'hint': hint_time, 'solve': solve_time}
     if status == pywraplp.Solver.OPTIMAL or status == pywraplp.Solver.FEASIBLE:
-        print(max_load.solution_value())
+        if aggregate:
+            counts = np.rint([v.solution_value() for v in y]).astype(np.int64)
+            selected = expand_assignment(aggregation, counts, reviews_per_paper)
+        else:
+            chosen = np.array([v.solution_value() for v in x]) > 0.5
+            selected = selected_from_mask(num_papers, reviews_per_paper, indices, chosen)
+        return max_load.solution_value(), MP_STATUS_NAMES[status], times, selected
+    return None, MP_STATUS_NAMES[status], times, None
+
+@time_execution
+def main():
+    args = parse_args()
+    num_papers, num_reviewers, reviews_per_paper, indptr, indices = input_data()
+    value, status, times, _ = solve(num_papers, num_reviewers, reviews_per_paper, indptr, indices,
+                                 args.compact, args.hint, args.aggregate)
+    if args.stats:
+        print(f"build: {times['build']:.4f}s hint: {times['hint']:.4f}s solve: {times['solve']:.4f}s", file=sys.stderr)
+    # In kết quả
+    if value is not None:
+        print(value)
         
     else:
         print('Không tìm được nghiệm tối ưu.')
-# Tạo solver: MIP = Mixed Integer Programming
-solver = pywraplp.Solver.CreateSolver('SCIP')
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,97 @@
+import argparse
+import glob
+import inspect
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmark_db import DB_PATH, connect, record_runs
+from check_matching import matching_possible
+from paper_assignment import Instance, get_solver, solve, solver_names
+
+# In-process replacement of the subprocess-per-script sweep of main.py: every instance is
+# read once and handed to the registered solver plugins (see paper_assignment), OR-Tools is
+# imported once per process, and the results come back as dicts instead of printed text.
+
+TEST_CASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Test_case')
+
+def solver_options(name, seed):
+    # The seed goes to the plugins that take one
+    if seed is not None and 'seed' in inspect.signature(get_solver(name)).parameters:
+        return {'seed': seed}
+    return {}
+
+def run_instance(path, solvers=None, seed=None):
+    # Runs every solver on the instance at path, after the feasibility check of
+    # check_matching.py. Returns one result dict per solver.
+    start_time = time.perf_counter()
+    instance = Instance.from_file(path)
+    load_time = time.perf_counter() - start_time
+    base = {'instance': path, 'instance_hash': instance.content_hash(), 'num_papers': instance.num_papers,
+            'num_reviewers': instance.num_reviewers, 'reviews_per_paper': instance.reviews_per_paper,
+            'load_time': round(load_time, 4)}
+    feasible = matching_possible(*instance.arrays())
+    results = []
+    for name in solvers or solver_names():
+        options = solver_options(name, seed)
+        result = dict(base, solver=name, seed=options.get('seed'), peak_memory=None)
+        if not feasible:
+            result.update(max_load=None, time=0.0, status='INFEASIBLE')
+        else:
+            try:
+                assignment = solve(name, instance, **options)
+                result.update(max_load=assignment.max_load, time=round(assignment.time, 4), status=assignment.status,
+                              peak_memory=assignment.peak_memory)
+                # multi-start local search reports the seed of the winning start
+                result['seed'] = assignment.stats.get('seed', result['seed'])
+            except Exception as e:
+                result.update(max_load=None, time=None, status=f'ERROR: {e}')
+        results.append(result)
+    return results
+
+def run_batch(paths, solvers=None, workers=1, seed=None):
+    # Instances are spread over a process pool, each worker runs all solvers on its instance.
+    # Results come back in the order of paths.
+    if workers == 1 or len(paths) <= 1:
+        return [result for path in paths for result in run_instance(path, solvers, seed)]
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(run_instance, path, solvers, seed) for path in paths]
+        return [result for future in futures for result in future.result()]
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the registered solvers on many instances in one process pool.")
+    parser.add_argument('instances', nargs='*', help="instance files (default: Test_case/*.txt)")
+    parser.add_argument('--solvers', nargs='+', choices=solver_names(), default=None)
+    parser.add_argument('--workers', type=int, default=1, help="processes, each one takes whole instances")
+    parser.add_argument('--seed', type=int, default=None, help="seed of the randomized solvers")
+    parser.add_argument('--json', action='store_true', help="one JSON result per line instead of a table")
+    parser.add_argument('--record', nargs='?', const=DB_PATH, default=None, metavar='DB',
+                        help="insert every run into the benchmark database (default Data/data.db)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    paths = args.instances or sorted(glob.glob(os.path.join(TEST_CASE_DIR, '*.txt')),
+                                     key=lambda p: int(os.path.basename(p)[4:-4]))
+    results = run_batch(paths, args.solvers, args.workers, args.seed)
+    if args.record:
+        conn = connect(args.record)
+        recorded = record_runs(conn, results)
+        conn.close()
+        print(f"Recorded {recorded} runs in {args.record}", file=sys.stderr)
+    if args.json:
+        for result in results:
+            print(json.dumps(result))
+        return
+    print(f"{'instance':<14}{'solver':<14}{'max_load':>10}{'time (s)':>10}{'peak (MiB)':>12}  status")
+    for result in results:
+        max_load = 'n/a' if result['max_load'] is None else f"{result['max_load']:g}"
+        time_taken = 'n/a' if result['time'] is None else f"{result['time']:.4f}"
+        peak = 'n/a' if result['peak_memory'] is None else f"{result['peak_memory'] / 1024:.1f}"
+        print(f"{os.path.basename(result['instance']):<14}{result['solver']:<14}{max_load:>10}{time_taken:>10}{peak:>12}"
+              f"  {result['status']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import os
+import time
+
+import flow_engine
+from flow_network import pre_processing_data
+from instance_io import read_instance
+
+try:
+    from ortools.graph.python import max_flow as ortools_max_flow
+except ImportError:
+    ortools_max_flow = None
+
+TEST_CASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Test_case')
+
+def time_engine(engine, num_papers, num_reviewers, reviews_per_paper, indptr, indices, repeat):
+    # Unbounded reviewer capacities, the same network check_matching.py solves
+    start_nodes, end_nodes, capacities = pre_processing_data(num_papers,num_reviewers,reviews_per_paper ,indptr,indices,num_papers)
+    best = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        smf = engine.SimpleMaxFlow()
+        smf.add_arcs_with_capacity(start_nodes, end_nodes, capacities)
+        smf.solve(0, num_papers + num_reviewers + 1)
+        best = min(best, time.perf_counter() - start_time)
+    return best, smf.optimal_flow(), len(start_nodes)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the built-in flow engine with OR-Tools SimpleMaxFlow.")
+    parser.add_argument('--cases', nargs='+', default=[f"case{i}.txt" for i in range(3, 9)])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'case':<12}{'arcs':>8}{'builtin (s)':>14}{'Marcs/s':>10}{'ortools (s)':>14}{'Marcs/s':>10}")
+    for case in args.cases:
+        instance = read_instance(os.path.join(TEST_CASE_DIR, case))
+        builtin_time, builtin_flow, num_arcs = time_engine(flow_engine, *instance, args.repeat)
+        row = f"{case:<12}{num_arcs:>8}{builtin_time:>14.4f}{num_arcs / builtin_time / 1e6:>10.2f}"
+        if ortools_max_flow is not None:
+            ortools_time, ortools_flow, _ = time_engine(ortools_max_flow, *instance, args.repeat)
+            if ortools_flow != builtin_flow:
+                print(f"{case}: flow mismatch, builtin {builtin_flow} ortools {ortools_flow}")
+            row += f"{ortools_time:>14.4f}{num_arcs / ortools_time / 1e6:>10.2f}"
+        else:
+            row += f"{'n/a':>14}{'n/a':>10}"
+        print(row)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import argparse
+import glob
+import os
+import statistics
+import sys
+import tempfile
+
+from batch import solver_options
+from benchmark_db import DB_PATH, SOLVER_TABLES, baseline_runs, connect, machine_name, record_runs
+from generate import generate_file
+from max_flow import min_max_load
+from paper_assignment import Instance, solve, solver_names
+
+# Performance regression gate: reruns a fixed suite and compares every solver with the runs
+# stored by batch.py --record (or by --record here). Exits with 1 when a solver got slower,
+# used more memory or returned a worse max_load than its baseline, or when its max_load is
+# inconsistent with the max-flow optimum of the instance or with the loads of the assignment
+# it returned.
+
+TEST_CASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Test_case')
+
+# Generated large instances, "PxRxKxD": P papers, R reviewers, K reviews per paper and D
+# uniformly drawn willing reviewers per paper
+LARGE_INSTANCES = ['20000x400x3x20', '50000x1000x3x10']
+# The exact models and the LP relaxation take minutes on the large instances
+LARGE_SOLVERS = ['greedy', 'local_search', 'max_flow']
+# Solvers whose OPTIMAL status means the optimal max_load (LP reports the status of the relaxation)
+EXACT_SOLVERS = ['max_flow', 'MIP', 'cp']
+
+def suite(large, directory):
+    cases = sorted(glob.glob(os.path.join(TEST_CASE_DIR, '*.txt')), key=lambda p: int(os.path.basename(p)[4:-4]))
+    entries = [(path, None) for path in cases]
+    for spec in large:
+        path = os.path.join(directory, f"large_{spec}.txt")
+        num_papers, num_reviewers, reviews_per_paper, degree = (int(v) for v in spec.split('x'))
+        generate_file(path, num_papers, num_reviewers, reviews_per_paper, degree=degree, seed=0)
+        entries.append((path, LARGE_SOLVERS))
+    return entries
+
+def measure(name, instance, repeat, seed):
+    # Median time and peak memory over repeat calls, max_load and status of the last one and
+    # whether every run reported the max load of the assignment it returned
+    options = solver_options(name, seed)
+    runs = [solve(name, instance, **options) for _ in range(repeat)]
+    peaks = [run.peak_memory for run in runs if run.peak_memory is not None]
+    consistent = all(run.max_load is None or run.selected is None
+                     or run.loads(instance.num_reviewers).max(initial=0) == run.max_load for run in runs)
+    return (statistics.median(run.time for run in runs), statistics.median(peaks) if peaks else None,
+            runs[-1].max_load, runs[-1].status, consistent)
+
+def check(name, optimum, current, baseline, args):
+    # Verdicts of one solver on one instance, an empty list when it passes
+    time_taken, peak, max_load, status, consistent = current
+    if optimum is None:
+        wrong = max_load is not None
+    else:
+        wrong = max_load is None or max_load < optimum or \
+            (name in EXACT_SOLVERS and status == 'OPTIMAL' and max_load != optimum)
+    failures = ['WRONG'] if wrong or not consistent else []
+    if not baseline:
+        return failures
+    base_time = statistics.median(row[0] for row in baseline)
+    if time_taken > base_time * (1 + args.time_tolerance) + args.min_time:
+        failures.append('SLOWER')
+    base_peaks = [row[1] for row in baseline if row[1] is not None]
+    if peak is not None and base_peaks and \
+            peak > statistics.median(base_peaks) * (1 + args.memory_tolerance) + args.min_memory * 1024:
+        failures.append('MEMORY')
+    # Heuristics may stay above the optimum, but not further above it than before
+    base_loads = [row[2] for row in baseline if row[2] is not None]
+    if max_load is not None and base_loads and max_load > max(base_loads):
+        failures.append('WORSE')
+    return failures
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Rerun the benchmark suite and fail on regressions against Data/data.db.")
+    parser.add_argument('--db', default=DB_PATH, help="benchmark database (default Data/data.db)")
+    parser.add_argument('--solvers', nargs='+', choices=[s for s in solver_names() if s in SOLVER_TABLES],
+                        default=[s for s in solver_names() if s in SOLVER_TABLES])
+    parser.add_argument('--large', nargs='*', default=LARGE_INSTANCES, metavar='PxRxKxD',
+                        help="generated large instances, none with an empty list")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per solver and instance, the median is compared")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the randomized solvers, fixed so max_load is comparable")
+    parser.add_argument('--time-tolerance', type=float, default=0.5,
+                        help="allowed relative slowdown of the median time")
+    parser.add_argument('--memory-tolerance', type=float, default=0.10, help="allowed relative peak memory growth")
+    parser.add_argument('--min-time', type=float, default=0.05,
+                        help="absolute slack in seconds, keeps timer noise on tiny instances out")
+    parser.add_argument('--min-memory', type=float, default=25.0,
+                        help="absolute slack in MiB, the peak growth of small runs is mostly allocator noise")
+    parser.add_argument('--any-machine', action='store_true', help="compare with baselines recorded on every host")
+    parser.add_argument('--baseline-version', default=None, help="only compare with the runs of this code version")
+    parser.add_argument('--record', action='store_true', help="store the new runs as baselines when the gate passes")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    conn = connect(args.db)
+    machine = None if args.any_machine else machine_name()
+    results = []
+    failed = False
+    print(f"{'instance':<28}{'solver':<14}{'time (s)':>18}{'peak (MiB)':>18}{'max_load':>10}{'opt':>6}  verdict")
+    with tempfile.TemporaryDirectory() as directory:
+        for path, solvers in suite(args.large, directory):
+            instance = Instance.from_file(path)
+            instance_hash = instance.content_hash()
+            optimum = min_max_load(*instance.arrays())
+            for name in args.solvers:
+                if solvers is not None and name not in solvers:
+                    continue
+                baseline = baseline_runs(conn, name, instance_hash, machine, args.baseline_version)
+                try:
+                    current = measure(name, instance, args.repeat, args.seed)
+                    failures = check(name, optimum, current, baseline, args)
+                except Exception as e:
+                    current, failures = (None, None, None, f'ERROR: {e}', False), ['ERROR']
+                failed |= bool(failures)
+                time_taken, peak, max_load, status, _ = current
+                verdict = ' '.join(failures) or ('ok' if baseline else 'no baseline')
+                base_time = f"{statistics.median(row[0] for row in baseline):.4f}" if baseline else '-'
+                base_peaks = [row[1] for row in baseline if row[1] is not None]
+                base_peak = f"{statistics.median(base_peaks) / 1024:.1f}" if base_peaks else '-'
+                now_time = 'n/a' if time_taken is None else f"{time_taken:.4f}"
+                now_peak = 'n/a' if peak is None else f"{peak / 1024:.1f}"
+                print(f"{os.path.basename(path):<28}{name:<14}{base_time + ' > ' + now_time:>18}"
+                      f"{base_peak + ' > ' + now_peak:>18}{'n/a' if max_load is None else max_load:>10}"
+                      f"{'n/a' if optimum is None else optimum:>6}  {verdict}")
+                results.append({'instance': path, 'instance_hash': instance_hash, 'num_papers': instance.num_papers,
+                                'num_reviewers': instance.num_reviewers, 'reviews_per_paper': instance.reviews_per_paper,
+                                'solver': name, 'max_load': max_load, 'time': time_taken, 'peak_memory': peak,
+                                'status': status, 'seed': solver_options(name, args.seed).get('seed')})
+    if args.record and not failed:
+        print(f"Recorded {record_runs(conn, results)} runs in {args.db}", file=sys.stderr)
+    conn.close()
+    if failed:
+        print("Performance regression", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import argparse
+import math
+import os
+import time
+
+from ortools.linear_solver import pywraplp
+
+from LP import LP_BACKENDS, choose_lp_backend
+from instance_io import read_instance
+from model_builder import build_linear_model
+
+TEST_CASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Test_case')
+
+def time_backend(backend, instance, compact):
+    start_time = time.perf_counter()
+    solver = pywraplp.Solver.CreateSolver(LP_BACKENDS[backend])
+    _, _, max_load = build_linear_model(solver, *instance, integer=False, compact=compact)
+    build_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    status = solver.Solve()
+    solve_time = time.perf_counter() - start_time
+    value = max_load.solution_value() if status in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE) else None
+    return build_time, solve_time, value
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the LP backends of LP.py: solve time and LP bound.")
+    parser.add_argument('--cases', nargs='+', default=sorted(os.listdir(TEST_CASE_DIR), key=lambda c: int(c[4:-4])))
+    parser.add_argument('--backends', nargs='+', choices=list(LP_BACKENDS), default=list(LP_BACKENDS))
+    parser.add_argument('--full', action='store_true', help="benchmark the full model instead of the compact one")
+    args = parser.parse_args()
+
+    # The bound column is the LP optimum, ceil(bound) is the integer optimum. The error is the
+    # distance to the simplex (GLOP / SCIP) bound, PDLP only solves up to a tolerance
+    print(f"{'case':<12}{'edges':>9}{'backend':>9}{'auto':>6}{'build (s)':>11}{'solve (s)':>11}{'bound':>14}{'ceil':>6}{'error':>10}")
+    for case in args.cases:
+        instance = read_instance(os.path.join(TEST_CASE_DIR, case))
+        num_edges = len(instance[4])
+        rows = [(backend, *time_backend(backend, instance, not args.full)) for backend in args.backends]
+        values = [value for backend, *_, value in rows if value is not None and backend != 'pdlp']
+        values += [value for *_, value in rows if value is not None]
+        reference = values[0] if values else None
+        for backend, build_time, solve_time, value in rows:
+            auto = '*' if backend == choose_lp_backend(num_edges) else ''
+            if value is None:
+                bound, ceiling, error = 'n/a', 'n/a', 'n/a'
+            else:
+                bound, ceiling, error = f"{value:.6f}", str(math.ceil(value - 1e-3)), f"{abs(value - reference):.1e}"
+            print(f"{os.path.basename(case):<12}{num_edges:>9}{backend:>9}{auto:>6}{build_time:>11.4f}{solve_time:>11.4f}"
+                  f"{bound:>14}{ceiling:>6}{error:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from ortools.linear_solver import pywraplp
+from ortools.sat.python import cp_model
+
+from instance_io import load_bounds, read_instance
+from model_builder import build_aggregated_cp_model, build_aggregated_linear_model, build_cp_model, build_linear_model
+from symmetry import Aggregation, class_counts, expand_assignment
+from warm_start import (heuristic_assignment, hint_aggregated_cp_model, hint_aggregated_linear_model, hint_cp_model,
+                        hint_linear_model)
+
+TEST_CASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Test_case')
+
+def expanded_max_load(aggregation, counts, instance):
+    # Max load of the per-paper assignment mapped back from the aggregated counts, after
+    # checking that every paper got K distinct willing reviewers
+    num_papers, num_reviewers, reviews_per_paper, indptr, indices = instance
+    selected = expand_assignment(aggregation, counts, reviews_per_paper)
+    for paper, reviewers in enumerate(selected.tolist()):
+        willing = set(indices[indptr[paper]:indptr[paper + 1]].tolist())
+        if len(set(reviewers)) != reviews_per_paper or not willing.issuperset(reviewers):
+            return None
+    return int(np.bincount(selected.ravel(), minlength=num_reviewers + 1)[1:].max())
+
+def time_scip(instance, model, time_limit, hint):
+    start_time = time.perf_counter()
+    solver = pywraplp.Solver.CreateSolver('SCIP')
+    if model == 'aggregated':
+        aggregation = Aggregation(*instance[:2], *instance[3:])
+        y, max_load = build_aggregated_linear_model(solver, aggregation, instance[2], *load_bounds(*instance[:3], instance[4]))
+        if hint is not None:
+            hint_aggregated_linear_model(solver, y, max_load, hint[0], class_counts(aggregation, *instance[3:], hint[1]))
+    else:
+        x, loads, max_load = build_linear_model(solver, *instance, compact=model == 'compact')
+        if hint is not None:
+            hint_linear_model(solver, instance[1], instance[4], x, loads, max_load, *hint)
+    build_time = time.perf_counter() - start_time
+    solver.SetTimeLimit(int(time_limit * 1000))
+    start_time = time.perf_counter()
+    status = solver.Solve()
+    solve_time = time.perf_counter() - start_time
+    value = max_load.solution_value() if status in (pywraplp.Solver.OPTIMAL, pywraplp.Solver.FEASIBLE) else None
+    if value is not None and model == 'aggregated':
+        value = expanded_max_load(aggregation, [round(v.solution_value()) for v in y], instance)
+    return build_time, solve_time, value, solver.NumConstraints()
+
+def time_cp_sat(instance, model, time_limit, hint):
+    start_time = time.perf_counter()
+    if model == 'aggregated':
+        aggregation = Aggregation(*instance[:2], *instance[3:])
+        cp, y, max_load = build_aggregated_cp_model(aggregation, instance[2], *load_bounds(*instance[:3], instance[4]))
+        if hint is not None:
+            hint_aggregated_cp_model(cp, y, max_load, hint[0], class_counts(aggregation, *instance[3:], hint[1]))
+    else:
+        cp, x, loads, max_load = build_cp_model(*instance, compact=model == 'compact')
+        if hint is not None:
+            hint_cp_model(cp, instance[1], instance[4], x, loads, max_load, *hint)
+    build_time = time.perf_counter() - start_time
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = time_limit
+    start_time = time.perf_counter()
+    status = solver.Solve(cp)
+    solve_time = time.perf_counter() - start_time
+    value = solver.ObjectiveValue() if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) else None
+    if value is not None and model == 'aggregated':
+        value = expanded_max_load(aggregation, [solver.Value(v) for v in y], instance)
+    return build_time, solve_time, value, len(cp.Proto().constraints)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the full, compact (no load variables) and aggregated models on SCIP and CP-SAT.")
+    parser.add_argument('--cases', nargs='+', default=sorted(os.listdir(TEST_CASE_DIR), key=lambda c: int(c[4:-4])))
+    parser.add_argument('--solvers', nargs='+', choices=['scip', 'cp-sat'], default=['scip', 'cp-sat'])
+    parser.add_argument('--models', nargs='+', choices=['full', 'compact', 'aggregated'], default=['full', 'compact'])
+    parser.add_argument('--time-limit', type=float, default=60.0, help="per solve, in seconds")
+    parser.add_argument('--hint', action='store_true',
+                        help="warm start every model from the greedy + local search assignment (computed once per case)")
+    args = parser.parse_args()
+
+    engines = {'scip': time_scip, 'cp-sat': time_cp_sat}
+    print(f"{'case':<12}{'solver':<8}{'model':<11}{'rows':>8}{'build (s)':>11}{'solve (s)':>11}{'max_load':>10}")
+    for case in args.cases:
+        instance = read_instance(os.path.join(TEST_CASE_DIR, case))
+        hint = None
+        if args.hint:
+            hint = heuristic_assignment(*instance[1:])
+            if hint[1] is None:
+                hint = None
+        for name in args.solvers:
+            for model in args.models:
+                build_time, solve_time, value, rows = engines[name](instance, model, args.time_limit, hint)
+                value = 'n/a' if value is None else f"{value:g}"
+                print(f"{os.path.basename(case):<12}{name:<8}{model:<11}{rows:>8}{build_time:>11.4f}{solve_time:>11.4f}{value:>10}")
+
+if __name__ == "__main__":
+    main()
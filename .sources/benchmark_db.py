@@ -0,0 +1,97 @@
+import os
+import platform
+import sqlite3
+import subprocess
+import time
+
+# Benchmark runs in Data/data.db. Data/schema.sql holds the original tables, one per solver,
+# MIGRATIONS bring an existing database up to date. PRAGMA user_version counts the applied
+# migrations, so every one runs once per database.
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Data')
+DB_PATH = os.path.join(DATA_DIR, 'data.db')
+SCHEMA_PATH = os.path.join(DATA_DIR, 'schema.sql')
+
+# Registry name of the solver plugin -> its table in schema.sql
+SOLVER_TABLES = {'greedy': 'greedy', 'max_flow': 'max_flow', 'local_search': 'local_search',
+                 'cp': 'CP', 'MIP': 'MIP', 'LP': 'LP'}
+
+# Columns of migration 1. peak_memory is the peak RSS growth of the run in KiB, version the
+# git commit of the code and machine the host the run was measured on.
+RUN_COLUMNS = [('instance_hash', 'TEXT'), ('seed', 'INTEGER'), ('peak_memory', 'INTEGER'), ('status', 'TEXT'),
+               ('version', 'TEXT'), ('machine', 'TEXT'), ('recorded_at', 'TEXT')]
+
+INSERT_COLUMNS = ('num_papers', 'num_reviewers', 'reviews_per_paper', 'max_load', 'time_execution',
+                  'instance_hash', 'seed', 'peak_memory', 'status', 'version', 'machine', 'recorded_at')
+
+def _add_run_columns(conn):
+    for table in SOLVER_TABLES.values():
+        existing = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+        for column, kind in RUN_COLUMNS:
+            if column not in existing:
+                conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {kind}')
+        conn.execute(f'CREATE INDEX IF NOT EXISTS {table}_instance ON {table} (instance_hash)')
+
+MIGRATIONS = [_add_run_columns]
+
+def migrate(conn):
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    for number, migration in enumerate(MIGRATIONS[version:], version + 1):
+        # sqlite3 does not open a transaction for DDL by itself
+        with conn:
+            conn.execute('BEGIN')
+            migration(conn)
+            conn.execute(f'PRAGMA user_version = {number}')
+
+def connect(path=DB_PATH):
+    conn = sqlite3.connect(path)
+    with open(SCHEMA_PATH) as f:
+        conn.executescript(f.read())
+    migrate(conn)
+    return conn
+
+def code_version():
+    # Commit of the checkout the solvers run from, None outside a git checkout
+    try:
+        out = subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                             capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return out.stdout.strip() or None
+
+def machine_name():
+    return f"{platform.node()} {platform.machine()} {os.cpu_count()} cpu"
+
+def record_runs(conn, results):
+    # Inserts the result dicts of batch.run_batch in one transaction, grouped per solver
+    # table. Returns the number of rows written, solvers without a table are skipped.
+    version, machine = code_version(), machine_name()
+    recorded_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+    rows = {}
+    for result in results:
+        table = SOLVER_TABLES.get(result['solver'])
+        if table is None:
+            continue
+        rows.setdefault(table, []).append((
+            result['num_papers'], result['num_reviewers'], result['reviews_per_paper'], result['max_load'],
+            result['time'], result['instance_hash'], result.get('seed'), result.get('peak_memory'), result['status'],
+            version, machine, recorded_at))
+    placeholders = ', '.join('?' * len(INSERT_COLUMNS))
+    with conn:
+        for table, values in rows.items():
+            conn.executemany(f"INSERT INTO {table} ({', '.join(INSERT_COLUMNS)}) VALUES ({placeholders})", values)
+    return sum(len(values) for values in rows.values())
+
+def baseline_runs(conn, solver, instance_hash, machine=None, version=None):
+    # (time_execution, peak_memory, max_load) of the stored successful runs of solver on the
+    # instance, optionally restricted to one machine and one code version
+    query = f"SELECT time_execution, peak_memory, max_load FROM {SOLVER_TABLES[solver]} WHERE instance_hash = ?" \
+            " AND time_execution IS NOT NULL AND status NOT LIKE 'ERROR%'"
+    params = [instance_hash]
+    if machine is not None:
+        query += " AND machine = ?"
+        params.append(machine)
+    if version is not None:
+        query += " AND version = ?"
+        params.append(version)
+    return conn.execute(query, params).fetchall()
@@ -1,87 +1,130 @@
 from ortools.sat.python import cp_model
+import numpy as np
+import argparse
+import json
+import sys
 import time
-
-def time_execution(func):
-    def wrapper(*args, **kwargs):
-        start_time = time.time()
-        result = func(*args, **kwargs)
-        end_time = time.time()
-        execution_time = end_time - start_time
-        print(f"{execution_time:.4f}")
-        return result
-    return wrapper
+from instance_io import load_bounds, read_instance, selected_from_mask
+from paper_assignment import time_execution
+from model_builder import build_aggregated_cp_model, build_cp_model
+from symmetry import Aggregation, class_counts, expand_assignment
+from warm_start import heuristic_assignment, hint_aggregated_cp_model, hint_cp_model
 
 
 def input_data():
-    with open('input.txt', 'r') as f:
-        num_papers,num_reviewers,reviews_per_paper = map(int, f.readline().strip().split())
-        willing_reviewers = {}
-        for i in range(num_papers):
-            line = list(map(int, f.readline().strip().split()))
-            paper_id = i+1
-            reviewers = line[1:]
-            willing_reviewers[paper_id] = reviewers
-    return num_papers, num_reviewers, reviews_per_paper, willing_reviewers
+    return read_instance('input.txt')
 
-@time_execution
-def main()->None:
-    # Read input data
-    num_papers, num_reviewers, reviews_per_paper, willing_reviewers = input_data()  
-    # Create the model
-    model = cp_model.CpModel()
-    # Create binary variables for each paper-reviewer pair
-    x= {}
-    for paper in range(1, num_papers + 1):
-        for reviewer in willing_reviewers[paper]:
-            x[(paper, reviewer)] = model.NewBoolVar(f'x[{paper},{reviewer}]')
+class ProgressCallback(cp_model.CpSolverSolutionCallback):
+    # Records every improving max_load as (wall time in s, max_load) and optionally streams it
+    def __init__(self, stream=None):
+        super().__init__()
+        self.stream = stream
+        self.improvements = []
+
+    def on_solution_callback(self):
+        value = int(self.ObjectiveValue())
+        self.improvements.append((round(self.WallTime(), 4), value))
+        if self.stream is not None:
+            print(f"max_load {value} at {self.WallTime():.4f}s, bound {self.BestObjectiveBound():g}", file=self.stream, flush=True)
+
+def configure_solver(solver, workers=None, time_limit=None, relative_gap=None):
+    if workers is not None:
+        solver.parameters.num_workers = workers
+    if time_limit is not None:
+        solver.parameters.max_time_in_seconds = time_limit
+    if relative_gap is not None:
+        solver.parameters.relative_gap_limit = relative_gap
 
-    # Each paper must be reviewed by exactly reviews_per_paper reviewers
-    for paper in range(1, num_papers + 1):
-        model.Add(sum(x[(paper, reviewer)] for reviewer in willing_reviewers[paper]) == reviews_per_paper)
-    # Load for each reviewer
-    loads = {}
-    for reviewer in range(1, num_reviewers + 1):
-        loads[reviewer] = model.NewIntVar(0, num_papers, f'load[{reviewer}]')
-        model.Add(loads[reviewer] == sum(x[(paper, reviewer)] for paper in range(1, num_papers + 1) if (paper, reviewer) in x))
-    
-    # Add constraints max of loads is minium
-    max_load = model.NewIntVar(0, num_papers, 'max_load')
-    for reviewer in range(1, num_reviewers + 1):
-        model.Add(loads[reviewer] <= max_load)
+def solve_stats(solver, status, callback, **times):
+    stats = {
+        'status': solver.StatusName(status),
+        'max_load': solver.ObjectiveValue() if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) else None,
+        'best_bound': solver.BestObjectiveBound(),
+        'conflicts': solver.NumConflicts(),
+        'branches': solver.NumBranches(),
+        'wall_time': solver.WallTime(),
+        'workers': solver.parameters.num_workers,
+        'improvements': callback.improvements,
+    }
+    stats.update({name: round(value, 4) for name, value in times.items()})
+    return stats
 
-    # Objective: minimize the maximum load
-    model.Minimize(max_load)
+def parse_args():
+    parser = argparse.ArgumentParser(description="CP-SAT model of the paper-reviewer assignment on input.txt.")
+    parser.add_argument('--stats', action='store_true',
+                        help="report build/hint/solve times and the solver statistics on stderr, as one JSON line")
+    parser.add_argument('--compact', action='store_true',
+                        help="no load variables, one sum <= max_load row per reviewer and bounded max_load")
+    parser.add_argument('--hint', action='store_true',
+                        help="seed the solver with a greedy + local search assignment and bound max_load by it")
+    parser.add_argument('--aggregate', action='store_true',
+                        help="one integer count per (paper class, reviewer class) of interchangeable papers / reviewers")
+    parser.add_argument('--workers', type=int, default=None, help="CP-SAT search workers (default: solver default)")
+    parser.add_argument('--time-limit', type=float, default=None, help="wall-clock limit of the solve in seconds")
+    parser.add_argument('--relative-gap', type=float, default=None,
+                        help="stop once (max_load - bound) / max_load is at most this")
+    parser.add_argument('--progress', action='store_true', help="stream every improving max_load on stderr")
+    return parser.parse_args()
+
+def solve(num_papers, num_reviewers, reviews_per_paper, indptr, indices, compact=False, hint=False, aggregate=False,
+          workers=None, time_limit=None, relative_gap=None, progress=None):
+    # Returns (max_load or None, status name, solve_stats dict, (P, K) array of the assigned
+    # reviewers or None), progress is an optional stream for the improving solutions
+    # Create the model: each paper gets reviews_per_paper reviewers, every load is at most
+    # max_load and max_load is minimized
+    build_start = time.perf_counter()
+    if aggregate:
+        # Interchangeable papers / reviewers are merged into equivalence classes
+        aggregation = Aggregation(num_papers, num_reviewers, indptr, indices)
+        low, high = load_bounds(num_papers, num_reviewers, reviews_per_paper, indices)
+        model, y, max_load = build_aggregated_cp_model(aggregation, reviews_per_paper, low, high)
+    else:
+        model, x, loads, max_load = build_cp_model(num_papers, num_reviewers, reviews_per_paper, indptr, indices,
+                                                   compact=compact)
+    build_time = time.perf_counter() - build_start
+
+    # Warm start from the heuristic assignment
+    hint_time = 0.0
+    if hint:
+        hint_start = time.perf_counter()
+        value, chosen = heuristic_assignment(num_reviewers, reviews_per_paper, indptr, indices)
+        if chosen is not None and aggregate:
+            hint_aggregated_cp_model(model, y, max_load, value, class_counts(aggregation, indptr, indices, chosen))
+        elif chosen is not None:
+            hint_cp_model(model, num_reviewers, indices, x, loads, max_load, value, chosen)
+        hint_time = time.perf_counter() - hint_start
 
     # Solve the model
     solver = cp_model.CpSolver()
-    status = solver.Solve(model)
-    # Print the solution
+    configure_solver(solver, workers, time_limit, relative_gap)
+    callback = ProgressCallback(progress)
+    solve_start = time.perf_counter()
+    status = solver.Solve(model, callback)
+    solve_time = time.perf_counter() - solve_start
+    stats = solve_stats(solver, status, callback, build=build_time, hint=hint_time, solve=solve_time)
     if status == cp_model.OPTIMAL or status == cp_model.FEASIBLE:
-        """print(num_papers)
-        for paper in range(1, num_papers + 1):
-            print(reviews_per_paper, end=' ')
-            for reviewer in willing_reviewers[paper]:
-                if solver.Value(x[(paper, reviewer)]) == 1:
-                    print(reviewer, end=' ')
-            print()"""
-        print(solver.ObjectiveValue())
+        if aggregate:
+            counts = np.array([solver.Value(v) for v in y], dtype=np.int64)
+            selected = expand_assignment(aggregation, counts, reviews_per_paper)
+        else:
+            chosen = np.array([solver.Value(v) for v in x], dtype=bool)
+            selected = selected_from_mask(num_papers, reviews_per_paper, indices, chosen)
+        return solver.ObjectiveValue(), solver.StatusName(status), stats, selected
+    return None, solver.StatusName(status), stats, None
+
+@time_execution
+def main()->None:
+    args = parse_args()
+    # Read input data
+    num_papers, num_reviewers, reviews_per_paper, indptr, indices = input_data()
+    value, status, stats, _ = solve(num_papers, num_reviewers, reviews_per_paper, indptr, indices, args.compact, args.hint,
+                                 args.aggregate, args.workers, args.time_limit, args.relative_gap,
+                                 sys.stderr if args.progress else None)
+    if args.stats:
+        print(json.dumps(stats), file=sys.stderr)
+    if value is not None:
+        print(value)
     else:
         print('No solution found.')
-    """# Print statistics
-    print()
-    print('Statistics:')
-    print(f'  status   : {solver.StatusName(status)}')
-    print(f'  conflicts: {solver.NumConflicts()}')
-    print(f'  branches : {solver.NumBranches()}')
-    print(f'  wall time: {solver.WallTime()} ms')
-    print(f'  load     : {solver.ObjectiveValue()}')"""
 if __name__ == "__main__":
     main()
-
-
-
-
-
-
-
-
@@ -0,0 +1,187 @@
+import numpy as np
+
+# Built-in replacement for ortools.graph.python.max_flow.SimpleMaxFlow, used when the
+# OR-Tools wheel is not installed. It implements the subset of the API the assignment
+# scripts use. Dinic's algorithm runs on CSR residual arrays, the BFS level graph is
+# built one frontier at a time with NumPy, and the blocking flow is pushed with
+# current-arc pointers. On the source -> paper -> reviewer -> sink networks of this
+# project the level graphs are shallow, so only a few phases are needed.
+
+class SimpleMaxFlow:
+    OPTIMAL = 0
+    POSSIBLE_OVERFLOW = 1
+    BAD_INPUT = 2
+    BAD_RESULT = 3
+
+    def __init__(self):
+        self._tails = []
+        self._heads = []
+        self._capacities = []
+        self._flow = None
+        self._optimal_flow = 0
+        self._last_terminals = None
+
+    def add_arc_with_capacity(self, tail, head, capacity):
+        self._tails.append(int(tail))
+        self._heads.append(int(head))
+        self._capacities.append(int(capacity))
+        return len(self._tails) - 1
+
+    def add_arcs_with_capacity(self, tails, heads, capacities):
+        first = len(self._tails)
+        self._tails.extend(np.asarray(tails, dtype=np.int64).tolist())
+        self._heads.extend(np.asarray(heads, dtype=np.int64).tolist())
+        self._capacities.extend(np.asarray(capacities, dtype=np.int64).tolist())
+        return np.arange(first, len(self._tails), dtype=np.int32)
+
+    def set_arc_capacity(self, arc, capacity):
+        self._capacities[arc] = int(capacity)
+
+    def num_arcs(self):
+        return len(self._tails)
+
+    def num_nodes(self):
+        if not self._tails:
+            return 0
+        return max(max(self._tails), max(self._heads)) + 1
+
+    def tail(self, arc):
+        return self._tails[arc]
+
+    def head(self, arc):
+        return self._heads[arc]
+
+    def capacity(self, arc):
+        return self._capacities[arc]
+
+    def optimal_flow(self):
+        return self._optimal_flow
+
+    def flow(self, arc):
+        return int(self._flow[arc]) if self._flow is not None else 0
+
+    def flows(self, arcs):
+        if self._flow is None:
+            return np.zeros(len(arcs), dtype=np.int64)
+        return self._flow[np.asarray(arcs, dtype=np.int64)]
+
+    def solve(self, source, sink):
+        num_arcs = len(self._tails)
+        num_nodes = max(self.num_nodes(), source + 1, sink + 1)
+        tails = np.asarray(self._tails, dtype=np.int64)
+        heads = np.asarray(self._heads, dtype=np.int64)
+        capacities = np.asarray(self._capacities, dtype=np.int64)
+        if num_arcs and capacities.min() < 0:
+            return self.BAD_INPUT
+
+        # Warm start from the previous flow when it still fits under the new capacities,
+        # e.g. when a max_load scan only raises the reviewer->sink arcs
+        flow = np.zeros(num_arcs, dtype=np.int64)
+        previous = self._flow
+        if (previous is not None and len(previous) == num_arcs
+                and self._last_terminals == (source, sink) and np.all(previous <= capacities)):
+            flow = previous.copy()
+
+        # Residual edges: 2*a is arc a, 2*a+1 its reverse, stored in CSR order by tail
+        edge_tails = np.empty(2 * num_arcs, dtype=np.int64)
+        edge_tails[0::2] = tails
+        edge_tails[1::2] = heads
+        edge_heads = np.empty(2 * num_arcs, dtype=np.int64)
+        edge_heads[0::2] = heads
+        edge_heads[1::2] = tails
+        residual = np.empty(2 * num_arcs, dtype=np.int64)
+        residual[0::2] = capacities - flow
+        residual[1::2] = flow
+
+        order = np.argsort(edge_tails, kind='stable')
+        position = np.empty_like(order)
+        position[order] = np.arange(2 * num_arcs)
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edge_tails, minlength=num_nodes), out=indptr[1:])
+        csr_heads = edge_heads[order]
+        csr_residual = residual[order]
+        # Partner of every CSR edge (forward <-> reverse)
+        csr_partner = position[order ^ 1]
+
+        total = int(flow[tails == source].sum() - flow[heads == source].sum()) if num_arcs else 0
+        while True:
+            level = self._levels(indptr, csr_heads, csr_residual, source, sink, num_nodes)
+            if level[sink] < 0:
+                break
+            total += self._blocking_flow(indptr, csr_heads, csr_residual, csr_partner, level, source, sink)
+
+        residual[order] = csr_residual
+        self._flow = residual[1::2].copy()
+        self._optimal_flow = total
+        self._last_terminals = (source, sink)
+        return self.OPTIMAL
+
+    @staticmethod
+    def _levels(indptr, csr_heads, csr_residual, source, sink, num_nodes):
+        level = np.full(num_nodes, -1, dtype=np.int64)
+        level[source] = 0
+        frontier = np.array([source], dtype=np.int64)
+        depth = 0
+        while frontier.size:
+            starts = indptr[frontier]
+            counts = indptr[frontier + 1] - starts
+            size = int(counts.sum())
+            if size == 0:
+                break
+            # Edge ids of every frontier node, concatenated
+            edges = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(size)
+            targets = csr_heads[edges]
+            targets = np.unique(targets[(csr_residual[edges] > 0) & (level[targets] < 0)])
+            depth += 1
+            level[targets] = depth
+            if level[sink] >= 0:
+                break
+            frontier = targets
+        return level
+
+    @staticmethod
+    def _blocking_flow(indptr, csr_heads, csr_residual, csr_partner, level, source, sink):
+        # Python lists are much faster than NumPy scalars for the pointer walk
+        heads = csr_heads.tolist()
+        residual = csr_residual.tolist()
+        partner = csr_partner.tolist()
+        level = level.tolist()
+        current = indptr[:-1].tolist()
+        end = indptr[1:].tolist()
+
+        pushed = 0
+        path = []
+        node = source
+        while True:
+            if node == sink:
+                bottleneck = min(residual[e] for e in path)
+                for e in path:
+                    residual[e] -= bottleneck
+                    residual[partner[e]] += bottleneck
+                pushed += bottleneck
+                # Restart from the tail of the first saturated edge
+                for i, e in enumerate(path):
+                    if residual[e] == 0:
+                        del path[i:]
+                        break
+                node = heads[path[-1]] if path else source
+                continue
+            e = current[node]
+            next_level = level[node] + 1
+            while e < end[node] and (residual[e] == 0 or level[heads[e]] != next_level):
+                e += 1
+            current[node] = e
+            if e < end[node]:
+                path.append(e)
+                node = heads[e]
+                continue
+            # Dead end: drop the node from the level graph and retreat
+            if node == source:
+                break
+            level[node] = -1
+            path.pop()
+            node = heads[path[-1]] if path else source
+            current[node] += 1
+
+        csr_residual[:] = residual
+        return pushed
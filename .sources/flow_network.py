@@ -0,0 +1,108 @@
+try:
+    from ortools.graph.python import max_flow
+except ImportError:
+    # Built-in Dinic engine for hosts without the OR-Tools wheel
+    import flow_engine as max_flow
+import numpy as np
+
+from instance_io import load_bounds, selected_from_mask
+
+# The source -> paper -> reviewer -> sink network shared by the max-flow solvers. Node 0 is
+# the source, papers are 1..P, reviewers P+1..P+R and P+R+1 is the sink. Arcs are added in
+# the order source->paper, paper->reviewer (CSR order), reviewer->sink.
+
+def pre_processing_data(num_papers,num_reviewers,reviews_per_paper ,indptr,indices,max_load):
+
+    source = 0
+    sink = num_papers + num_reviewers + 1
+    papers = np.arange(1, num_papers + 1, dtype=np.int32)
+    reviewers = np.arange(1, num_reviewers + 1, dtype=np.int32)
+
+    start_nodes = np.concatenate((
+        np.full(num_papers, source, dtype=np.int32),    # Arcs from source to papers
+        np.repeat(papers, np.diff(indptr)),             # Arcs from papers to reviewers, in CSR order
+        reviewers + num_papers,                         # Arcs from reviewers to sink
+    ))
+    end_nodes = np.concatenate((
+        papers,
+        indices + num_papers,                           # Add offset here
+        np.full(num_reviewers, sink, dtype=np.int32),
+    ))
+    capacities = np.concatenate((
+        np.full(num_papers, reviews_per_paper, dtype=np.int64),
+        np.ones(len(indices), dtype=np.int64),
+        np.full(num_reviewers, max_load, dtype=np.int64),
+    ))
+    return start_nodes, end_nodes, capacities
+
+def build_network(num_papers, num_reviewers, reviews_per_paper, indptr, indices, max_load):
+    # The network is built once, only the reviewer->sink capacities depend on max_load
+    smf = max_flow.SimpleMaxFlow()
+    start_nodes, end_nodes, capacities = pre_processing_data(num_papers,num_reviewers,reviews_per_paper ,indptr,indices,max_load)
+    all_arcs = smf.add_arcs_with_capacity(start_nodes, end_nodes, capacities)
+    # Paper->reviewer arcs follow the num_papers source arcs in CSR order, so edge e of the
+    # instance is arc edge_arcs[e]. Reviewer->sink arcs are the last num_reviewers arcs added
+    edge_arcs = all_arcs[num_papers:num_papers + len(indices)]
+    sink_arcs = all_arcs[len(all_arcs) - num_reviewers:]
+    return smf, edge_arcs, sink_arcs
+
+def solve_max_flow(network, num_papers, num_reviewers, reviews_per_paper, max_load):
+    # (feasible, edge flows of a feasible probe or None) with every reviewer capped at max_load
+    smf, edge_arcs, sink_arcs = network
+    for arc in sink_arcs:
+        smf.set_arc_capacity(arc, max_load)
+    status = smf.solve(0, num_papers + num_reviewers + 1)
+    feasible = (status == smf.OPTIMAL) and smf.optimal_flow() == num_papers * reviews_per_paper
+    # Keep the edge flows of a feasible probe, the next probe overwrites them
+    return feasible, smf.flows(edge_arcs) if feasible else None
+
+def selected_reviewers(num_papers, reviews_per_paper, indices, edge_flows):
+    # A feasible flow saturates every source arc, so each paper has exactly reviews_per_paper
+    # unit edges and the chosen reviewers, in CSR order, reshape to one row per paper
+    return selected_from_mask(num_papers, reviews_per_paper, indices, edge_flows == 1)
+
+def search_max_load(num_papers, num_reviewers, reviews_per_paper, indptr, indices, search='gallop'):
+    # (smallest feasible max_load or None, its edge flows, number of max-flow solves)
+    low, high = load_bounds(num_papers, num_reviewers, reviews_per_paper, indices)
+    num_solves = 0
+    network = build_network(num_papers, num_reviewers, reviews_per_paper, indptr, indices, low)
+    
+    def probe(max_load):
+        nonlocal num_solves
+        num_solves += 1
+        return solve_max_flow(network, num_papers, num_reviewers, reviews_per_paper, max_load)
+
+    if search == 'linear':
+        for max_load in range(low, high + 1):
+            feasible, solution = probe(max_load)
+            if feasible:
+                return max_load, solution, num_solves
+        return None, None, num_solves
+
+    # Galloping: double the step above the lower bound until a feasible load is found
+    infeasible = low - 1
+    step = 1
+    max_load = low
+    while True:
+        feasible, solution = probe(max_load)
+        if feasible:
+            break
+        infeasible = max_load
+        if max_load >= high:
+            # Even unbounded reviewer capacities can not cover every paper
+            return None, None, num_solves
+        max_load = min(max_load + step, high)
+        step *= 2
+
+    # Binary search on (infeasible, max_load], keeping the best feasible flow
+    best_load, best_solution = max_load, solution
+    lo, hi = infeasible + 1, max_load - 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        feasible, solution = probe(mid)
+        if feasible:
+            best_load, best_solution = mid, solution
+            hi = mid - 1
+        else:
+            lo = mid + 1
+    return best_load, best_solution, num_solves
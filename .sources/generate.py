@@ -1,18 +1,265 @@
-import random
+import argparse
+import sys
+
+import numpy as np
+
+# Seeded instance generator. Papers are drawn in batches with NumPy and every batch is
+# written out before the next one is drawn, so the memory stays bounded by the batch size.
+# Distributions:
+#   uniform    every paper is willing to be reviewed by a uniform sample of the reviewers
+#   zipf       reviewer popularity follows a Zipf law, a few reviewers are willing for most papers
+#   clustered  reviewers form topic communities, papers sample their own community and, with
+#              probability --cross, the next one
+#   tight      a balanced assignment with load ceil(P*K/R) is planted and every paper gets at
+#              most --extra more reviewers, so the instance is feasible with almost no slack
+
+DISTRIBUTIONS = ['uniform', 'zipf', 'clustered', 'tight']
+
+# Edges per batch
+BATCH_EDGES = 1 << 20
+# Entries of the per-row score matrix of the dense sampler
+DENSE_CELLS = 1 << 22
+
+def _sorted_unique(keys):
+    # np.unique hashes instead of sorting for large int arrays, several times slower here
+    keys = np.sort(keys)
+    keep = np.ones(len(keys), dtype=bool)
+    keep[1:] = keys[1:] != keys[:-1]
+    return keys[keep]
+
+def _sample_sparse(rng, degrees, universe, cdf, keys):
+    # Rejection sampling: draw the missing reviewers of every row with replacement and drop the
+    # duplicates until each row has degrees[i] distinct ones. keys holds row * stride + offset
+    # of the entries already chosen, offsets are below universe[i].
+    stride = int(universe.max(initial=0))
+    need = degrees - np.bincount(keys // stride, minlength=len(degrees)) if stride else degrees * 0
+    while need.any():
+        rows = np.repeat(np.arange(len(degrees), dtype=np.int64), need)
+        if cdf is None:
+            offsets = rng.integers(0, universe[rows])
+        else:
+            offsets = np.searchsorted(cdf, rng.random(len(rows)) * cdf[-1], side='right')
+        keys = _sorted_unique(np.concatenate((keys, rows * stride + offsets)))
+        need = degrees - np.bincount(keys // stride, minlength=len(degrees))
+    return keys // stride, keys % stride
+
+def _sample_dense(rng, degrees, universe, weights, keys):
+    # Top-degree random keys per row (Efraimidis-Spirakis for weighted rows), the same
+    # distribution as the rejection sampler but without retries for rows close to universe
+    stride = int(universe.max(initial=0))
+    scores = np.log(rng.random((len(degrees), stride)))
+    if weights is not None:
+        scores /= weights
+    scores[np.arange(stride) >= universe[:, None]] = -np.inf
+    scores.flat[keys] = np.inf
+    threshold = -np.sort(-scores, axis=1)[np.arange(len(degrees)), np.maximum(degrees - 1, 0)]
+    chosen = (scores >= threshold[:, None]) & (degrees[:, None] > 0)
+    return np.nonzero(chosen)
+
+def _expected_draws(weights, degree):
+    # Draws a weighted row of this degree needs at worst: the heaviest offsets come first and
+    # the i-th new one takes 1 / (1 - mass already held) draws
+    held = np.cumsum(np.sort(weights)[::-1][:degree]) / weights.sum()
+    held = np.concatenate(([0.0], held[:-1]))
+    return float(np.sum(1 / np.maximum(1 - held, 1e-12)))
+
+def sample_rows(rng, degrees, universe, weights=None, planted=None):
+    # degrees[i] distinct offsets below universe[i] for every row i, drawn proportionally to
+    # weights when given, always containing the planted (rows, offsets) pairs. Returns
+    # (rows, offsets) sorted by row, then offset.
+    degrees = np.minimum(degrees, universe).astype(np.int64)
+    stride = int(universe.max(initial=0))
+    keys = np.empty(0, dtype=np.int64) if planted is None else _sorted_unique(planted[0] * stride + planted[1])
+    # Rejection only pays off when a draw rarely hits an offset the row already has. Unweighted
+    # that is when the rows take a small part of their universe, weighted rows are compared
+    # by the draws they need against the universe the dense sampler scores (4 * degree <=
+    # universe is about 0.29 * universe draws), skewed Zipf rows would retry for minutes.
+    if weights is None:
+        sparse = 4 * degrees.sum() <= universe.sum()
+    else:
+        sparse = 3 * _expected_draws(weights, int(degrees.max(initial=0))) <= len(weights)
+    if sparse:
+        return _sample_sparse(rng, degrees, universe, None if weights is None else np.cumsum(weights), keys)
+    # The score matrix is built for DENSE_CELLS entries at a time
+    chunk = max(1, DENSE_CELLS // max(stride, 1))
+    rows, offsets = [], []
+    for first in range(0, len(degrees), chunk):
+        last = min(first + chunk, len(degrees))
+        lo, hi = np.searchsorted(keys, [first * stride, last * stride])
+        chunk_rows, chunk_offsets = _sample_dense(rng, degrees[first:last], universe[first:last], weights,
+                                                  keys[lo:hi] - first * stride)
+        rows.append(chunk_rows + first)
+        offsets.append(chunk_offsets)
+    return np.concatenate(rows), np.concatenate(offsets)
+
+def _digits(values):
+    digits = np.ones(len(values), dtype=np.int64)
+    for power in range(1, 19):
+        digits += values >= 10 ** power
+    return digits
+
+def format_rows(degrees, reviewers):
+    # "count r1 r2 ..." lines of a batch as bytes, written digit place by digit place into one
+    # buffer instead of one str() per token
+    starts = np.concatenate(([0], np.cumsum(degrees)[:-1])).astype(np.int64)
+    tokens = np.insert(reviewers.astype(np.int64), starts, degrees)
+    digits = _digits(tokens)
+    # Every token is followed by a space, or a line break after the last token of a row
+    ends = np.cumsum(digits + 1) - 1
+    buf = np.full(int(ends[-1]) + 1 if len(ends) else 0, ord(' '), dtype=np.uint8)
+    buf[ends[starts + np.arange(len(degrees)) + degrees]] = ord('\n')
+    place, value = 0, tokens
+    while len(value):
+        buf[ends - 1 - place] = value % 10 + ord('0')
+        place += 1
+        keep = digits > place
+        value, ends, digits = value[keep] // 10, ends[keep], digits[keep]
+    return buf.tobytes()
+
+def _degrees(rng, rows, universe, reviews_per_paper, density, degree):
+    if degree is not None:
+        degrees = np.full(rows, degree, dtype=np.int64)
+    else:
+        low = (density[0] * universe).astype(np.int64)
+        high = (density[1] * universe).astype(np.int64)
+        degrees = rng.integers(low, np.maximum(high, low) + 1)
+    # A paper with fewer willing reviewers than K could never be covered
+    return np.clip(degrees, np.minimum(reviews_per_paper, universe), universe)
+
+class Generator:
+    # Draws the papers of one distribution batch by batch. batch(first, rows) returns the
+    # (degrees, reviewers) of papers first .. first + rows - 1 (0-based), reviewers 1-based
+    # and in random order inside every paper.
+    def __init__(self, num_papers, num_reviewers, reviews_per_paper, distribution='uniform', density=(0.2, 0.7),
+                 degree=None, zipf_exponent=1.0, communities=10, cross=0.3, extra=1, seed=None):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown distribution {distribution!r}, available: {', '.join(DISTRIBUTIONS)}")
+        self.num_papers = num_papers
+        self.num_reviewers = num_reviewers
+        self.reviews_per_paper = reviews_per_paper
+        self.distribution = distribution
+        self.density = density
+        self.degree = degree
+        self.cross = cross
+        self.extra = extra
+        self.rng = np.random.default_rng(seed)
+        self.weights = None
+        if distribution == 'zipf':
+            # Popularity rank of every reviewer is a random permutation, not its id
+            ranks = self.rng.permutation(num_reviewers) + 1
+            self.weights = ranks.astype(np.float64) ** -zipf_exponent
+        elif distribution == 'clustered':
+            # Every community keeps at least K reviewers, or its papers could not be covered
+            communities = max(1, min(communities, num_reviewers // max(reviews_per_paper, 1)))
+            self.community_start = np.linspace(0, num_reviewers, communities + 1).astype(np.int64)
+            self.community_size = np.diff(self.community_start)
+        elif distribution == 'tight':
+            if reviews_per_paper > num_reviewers:
+                raise ValueError("A tight instance needs reviews_per_paper <= num_reviewers")
+            self.permutation = self.rng.permutation(num_reviewers)
+
+    def average_degree(self):
+        if self.distribution == 'tight':
+            return self.reviews_per_paper + self.extra / 2
+        if self.degree is not None:
+            return self.degree
+        universe = self.num_reviewers
+        if self.distribution == 'clustered':
+            universe = self.num_reviewers / len(self.community_size) * (1 + self.cross)
+        return max(1.0, universe * (self.density[0] + self.density[1]) / 2)
+
+    def batch(self, first, rows):
+        rng = self.rng
+        universe = np.full(rows, self.num_reviewers, dtype=np.int64)
+        if self.distribution == 'clustered':
+            paper, reviewers = self._clustered(rows)
+        elif self.distribution == 'tight':
+            paper, reviewers = self._tight(first, rows, universe)
+        else:
+            degrees = _degrees(rng, rows, universe, self.reviews_per_paper, self.density, self.degree)
+            paper, offsets = sample_rows(rng, degrees, universe, self.weights)
+            reviewers = offsets + 1
+        # Shuffle inside every paper like random.sample did: the solvers take the reviewers in
+        # file order and CP-SAT needs minutes on the 700x70 default instance with sorted rows
+        order = np.argsort(paper + rng.random(len(paper)), kind='stable')
+        return np.bincount(paper, minlength=rows), reviewers[order]
+
+    def _tight(self, first, rows, universe):
+        # Paper p gets the planted reviewers (p*K + j) mod R, j < K, through a random relabelling,
+        # so every reviewer has load floor or ceil of P*K/R
+        reviews_per_paper = self.reviews_per_paper
+        slots = (np.arange(first, first + rows, dtype=np.int64)[:, None] * reviews_per_paper
+                 + np.arange(reviews_per_paper)) % self.num_reviewers
+        planted = (np.repeat(np.arange(rows, dtype=np.int64), reviews_per_paper), self.permutation[slots.ravel()])
+        degrees = reviews_per_paper + self.rng.integers(0, self.extra + 1, rows)
+        paper, offsets = sample_rows(self.rng, degrees, universe, planted=planted)
+        return paper, offsets + 1
+
+    def _clustered(self, rows):
+        rng = self.rng
+        size, start = self.community_size, self.community_start
+        home = rng.integers(0, len(size), rows)
+        # Interdisciplinary papers also sample the next community
+        second = np.where(rng.random(rows) < self.cross, (home + 1) % len(size), home)
+        universe = size[home] + np.where(second != home, size[second], 0)
+        degrees = _degrees(rng, rows, universe, self.reviews_per_paper, self.density, self.degree)
+        paper, offsets = sample_rows(rng, degrees, universe)
+        in_home = offsets < size[home][paper]
+        reviewers = np.where(in_home, start[home][paper] + offsets, start[second][paper] + offsets - size[home][paper])
+        return paper, reviewers + 1
+
+def generate(stream, num_papers, num_reviewers, reviews_per_paper, batch_size=None, **options):
+    # Writes the instance to the binary stream batch by batch
+    generator = Generator(num_papers, num_reviewers, reviews_per_paper, **options)
+    if batch_size is None:
+        batch_size = max(1, int(BATCH_EDGES // generator.average_degree()))
+    stream.write(f"{num_papers} {num_reviewers} {reviews_per_paper}\n".encode())
+    for first in range(0, num_papers, batch_size):
+        rows = min(batch_size, num_papers - first)
+        degrees, reviewers = generator.batch(first, rows)
+        stream.write(format_rows(degrees, reviewers))
+
+def generate_file(path, num_papers, num_reviewers, reviews_per_paper, **options):
+    with open(path, 'wb') as f:
+        generate(f, num_papers, num_reviewers, reviews_per_paper, **options)
 
 def generate_test_case():
     P = 700 # Số papers
     R = 70 # Số reviewers
     K = 3  #Số reviewers mỗi paper cần
-    
-
-    with open('input.txt', 'w') as f:
-        # Dòng đầu: P R K
-        f.write(f"{P} {R} {K}\n")
-        # Mỗi paper chọn ngẫu nhiên 5 reviewers từ R reviewers
-        for paper in range(1, P + 1):
-            nums=random.randint(int(0.2*R),int(0.7*R) )
-            reviewers= random.sample(range(1, R+1),nums )
-            f.write(f"{nums} {' '.join(map(str, reviewers))}\n")
+    # Each paper is willing to be reviewed by 20%..70% of the reviewers
+    generate_file('input.txt', P, R, K)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate a paper-reviewer assignment instance.")
+    parser.add_argument('-o', '--output', default='input.txt', help="instance file, - for stdout (default input.txt)")
+    parser.add_argument('-P', '--papers', type=int, default=700)
+    parser.add_argument('-R', '--reviewers', type=int, default=70)
+    parser.add_argument('-K', '--reviews-per-paper', type=int, default=3)
+    parser.add_argument('--distribution', choices=DISTRIBUTIONS, default='uniform')
+    parser.add_argument('--seed', type=int, default=None, help="same seed and parameters give the same instance")
+    parser.add_argument('--density', type=float, nargs=2, default=(0.2, 0.7), metavar=('LOW', 'HIGH'),
+                        help="willing reviewers per paper as a fraction of the candidates (all reviewers, or the "
+                             "paper's communities when clustered)")
+    parser.add_argument('--degree', type=int, default=None, help="fixed number of willing reviewers per paper, "
+                                                                "instead of --density")
+    parser.add_argument('--zipf-exponent', type=float, default=1.0, help="zipf: popularity of the i-th reviewer ~ i^-s")
+    parser.add_argument('--communities', type=int, default=10, help="clustered: number of reviewer communities")
+    parser.add_argument('--cross', type=float, default=0.3,
+                        help="clustered: fraction of the papers that also sample the next community")
+    parser.add_argument('--extra', type=int, default=1, help="tight: at most this many reviewers beyond the planted K")
+    parser.add_argument('--batch-size', type=int, default=None, help="papers per batch (default ~1M edges)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    options = dict(distribution=args.distribution, density=tuple(args.density), degree=args.degree,
+                   zipf_exponent=args.zipf_exponent, communities=args.communities, cross=args.cross,
+                   extra=args.extra, seed=args.seed, batch_size=args.batch_size)
+    if args.output == '-':
+        generate(sys.stdout.buffer, args.papers, args.reviewers, args.reviews_per_paper, **options)
+    else:
+        generate_file(args.output, args.papers, args.reviewers, args.reviews_per_paper, **options)
+
 if __name__ == "__main__":
-    generate_test_case()
\ No newline at end of file
+    main()
@@ -1,63 +1,102 @@
-import time
+import argparse
+import heapq
+import numpy as np
+from instance_io import read_instance
+from paper_assignment import time_execution
 
-def time_execution(func):
-    def wrapper(*args, **kwargs):
-        start_time = time.time()
-        result = func(*args, **kwargs)
-        end_time = time.time()
-        execution_time = end_time - start_time
-        print(f"{execution_time:.4f}")
-        return result
-    return wrapper
 
 def input_data():
-    with open('input.txt','r') as f:
-        num_papers,num_reviewers,reviews_per_paper = map(int, f.readline().strip().split())
-        willing_reviewers = {}
-        for i in range(num_papers):
-            line = list(map(int, f.readline().strip().split()))
-            paper_id = i+1
-            reviewers = line[1:]
-            willing_reviewers[paper_id] = reviewers
-        #Crate a 
-        willing_papers = {}
-        for i in range(1,num_reviewers+1):
-            for j in range(1,num_papers+1):
-                if i in willing_reviewers[j]:
-                    willing_papers[i] = willing_papers.get(i, []) + [j]
-        #print(willing_papers)
-    return num_papers, num_reviewers, reviews_per_paper, willing_reviewers, willing_papers
+    return read_instance('input.txt')
 
-def matching_papers(num_papers, num_reviewers, reviews_per_paper, willing_reviewers):
-    load = [0] * (num_reviewers + 1)
-    sorted_dict = dict(sorted(willing_reviewers.items(), key=lambda item: len(item[1])))
-    selected_reviewers = {}
-    for paper,reviewers in sorted_dict.items():
-        #Sort the reviewers by their current load
-        reviewers.sort(key=lambda x: load[x])
-        # Select the first K reviewers
-        selected_reviewers[paper] = reviewers[:reviews_per_paper]
-        # Update the load of the selected reviewers
-        for reviewer in selected_reviewers[paper]:
-            load[reviewer] += 1
-    # Find the maximum load
-    max_load = max(load[1:])
-    return max_load, selected_reviewers
+def greedy_assign(num_reviewers, reviews_per_paper, indptr, indices, batch_size=0, seed=None):
+    # Greedy on CSR arrays: papers with the fewest willing reviewers go first and take
+    # their K least loaded reviewers. Returns the load per reviewer (index 0 unused) and a
+    # (num_papers, K) array of chosen reviewers, padded with 0 when a paper has fewer than K.
+    # With a seed, papers of the same degree are visited in a random order.
+    num_papers = len(indptr) - 1
+    degrees = np.diff(indptr)
+    if seed is None:
+        order = np.argsort(degrees, kind='stable')
+    else:
+        shuffled = np.random.default_rng(seed).permutation(num_papers)
+        order = shuffled[np.argsort(degrees[shuffled], kind='stable')]
+
+    if batch_size <= 0:
+        # Exact sequential greedy, a partial selection per paper instead of a full sort
+        load = [0] * (num_reviewers + 1)
+        key = load.__getitem__
+        flat = indices.tolist()
+        bounds = indptr.tolist()
+        picks = [None] * num_papers
+        for paper in order.tolist():
+            chosen = heapq.nsmallest(reviews_per_paper, flat[bounds[paper]:bounds[paper + 1]], key=key)
+            for reviewer in chosen:
+                load[reviewer] += 1
+            if len(chosen) < reviews_per_paper:
+                chosen += [0] * (reviews_per_paper - len(chosen))
+            picks[paper] = chosen
+        selected = np.array(picks, dtype=np.int32).reshape(num_papers, reviews_per_paper)
+        return np.array(load, dtype=np.int64), selected
+
+    # Batched greedy: papers of the same degree are processed batch_size at a time in
+    # sub-rounds. Every paper of the batch that still misses reviewers proposes its least
+    # loaded reviewer it does not have yet, each reviewer accepts its first proposal only and
+    # the loads are updated before the next sub-round, so the batch sees its own picks.
+    load = np.zeros(num_reviewers + 1, dtype=np.int64)
+    selected = np.zeros((num_papers, reviews_per_paper), dtype=np.int32)
+    sorted_degrees = degrees[order]
+    bucket_starts = np.flatnonzero(np.diff(sorted_degrees, prepend=-1))
+    bucket_ends = np.append(bucket_starts[1:], num_papers)
+    for start, end in zip(bucket_starts.tolist(), bucket_ends.tolist()):
+        degree = int(sorted_degrees[start])
+        if degree == 0:
+            continue
+        k = min(reviews_per_paper, degree)
+        for first in range(start, end, batch_size):
+            papers = order[first:min(first + batch_size, end)]
+            rows = indices[indptr[papers][:, None] + np.arange(degree)]
+            # Load ties are broken at a different position for every paper, otherwise the
+            # whole batch proposes the first tied reviewers of its rows
+            tie_break = (np.arange(degree) + papers[:, None]) % degree
+            taken = np.zeros(rows.shape, dtype=bool)
+            picked = np.zeros(len(papers), dtype=np.int64)
+            active = np.arange(len(papers))
+            while len(active):
+                keys = load[rows[active]] * degree + tie_break[active]
+                keys[taken[active]] = np.iinfo(np.int64).max
+                columns = keys.argmin(axis=1)
+                proposals = rows[active, columns]
+                # Batch order is the sequential order, the first proposal of a reviewer wins
+                _, winners = np.unique(proposals, return_index=True)
+                taken[active[winners], columns[winners]] = True
+                load[proposals[winners]] += 1
+                picked[active[winners]] += 1
+                active = active[picked[active] < k]
+            selected[papers, :k] = rows[taken].reshape(len(papers), k)
+    return load, selected
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Greedy paper-reviewer assignment on input.txt.")
+    parser.add_argument('--batch-size', type=int, default=0,
+                        help="process papers of the same degree in NumPy batches of this size, picks inside a batch are "
+                             "resolved in sub-rounds (0: exact sequential greedy)")
+    return parser.parse_args()
 
 @time_execution
 def main():
-    num_papers, num_reviewers, reviews_per_paper, willing_reviewers, willing_papers = input_data()
-    willing_papers=dict(sorted(willing_papers.items(), key=lambda item: len(item[1])))
+    args = parse_args()
+    num_papers, num_reviewers, reviews_per_paper, indptr, indices = input_data()
 
     if (num_papers*reviews_per_paper) % num_reviewers == 0:
         min_capactice_max_load=(num_papers*reviews_per_paper) // num_reviewers
     else:
         min_capactice_max_load=(num_papers*reviews_per_paper) // num_reviewers + 1
-    max_load, selected_reviewers = matching_papers(num_papers, num_reviewers, reviews_per_paper, willing_reviewers)
+    load, selected = greedy_assign(num_reviewers, reviews_per_paper, indptr, indices, args.batch_size)
+    max_load = int(load[1:].max())
     # Print the selected reviewers
     """print(num_papers)
-    for paper, reviewers in selected_reviewers.items():
-        print(f"{reviews_per_paper} {' '.join(map(str, reviewers))}")"""
+    for reviewers in selected.tolist():
+        print(f"{reviews_per_paper} {' '.join(str(r) for r in reviewers if r)}")"""
     print(f"{max_load}")
 
 if __name__ == "__main__":
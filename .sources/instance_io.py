@@ -0,0 +1,177 @@
+import hashlib
+import mmap
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Shared loader for the "P R K" + one "count reviewer..." line per paper instance format.
+# The file is read in one go and parsed with NumPy, papers come back as CSR arrays:
+# the willing reviewers of paper p (1-based) are indices[indptr[p-1]:indptr[p]].
+#
+# Parsed instances are cached in CACHE_DIR as <sha256 of the text>.bin: a header of
+# CACHE_MAGIC, P, R, K and the edge count, then indptr and indices as int32. Later loads
+# map the file and return views on it, nothing is parsed or copied. A file read by path is
+# hashed on every load: SHA-256 streams at about a GB/s, a fraction of the parse, while a
+# size + mtime stamp misses a same-size rewrite within the mtime granularity (main.py
+# regenerating input.txt) and would hand back the previous instance. INSTANCE_CACHE_DIR
+# moves the cache, an empty value turns it off.
+
+CACHE_DIR = os.environ.get('INSTANCE_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'paper_assignment'))
+CACHE_MAGIC = b'PAI1'
+CACHE_HEADER = np.dtype([('magic', 'S4'), ('pad', '<i4'), ('num_papers', '<i8'), ('num_reviewers', '<i8'),
+                         ('reviews_per_paper', '<i8'), ('num_edges', '<i8')])
+
+def parse_instance(buf):
+    tokens = np.fromstring(buf, dtype=np.int64, sep=' ')
+    if tokens.size < 3:
+        raise ValueError("Instance must start with 'num_papers num_reviewers reviews_per_paper'")
+    num_papers, num_reviewers, reviews_per_paper = (int(v) for v in tokens[:3])
+
+    counts = _row_lengths(buf, tokens, num_papers)
+    indptr = np.zeros(num_papers + 1, dtype=np.int32)
+    np.cumsum(counts, out=indptr[1:])
+    # Drop the leading count of every row, the remaining tokens are the reviewers in CSR order
+    body = tokens[3:3 + num_papers + int(indptr[-1])]
+    is_count = np.zeros(body.size, dtype=bool)
+    is_count[indptr[:-1] + np.arange(num_papers)] = True
+    indices = body[~is_count].astype(np.int32)
+    if indices.size and (indices.min() < 1 or indices.max() > num_reviewers):
+        raise ValueError("Reviewer id out of range 1..num_reviewers")
+    return num_papers, num_reviewers, reviews_per_paper, indptr, indices
+
+def _row_lengths(buf, tokens, num_papers):
+    # Every paper sits on its own line: count the tokens of each line without a Python loop
+    raw = np.frombuffer(buf, dtype=np.uint8)
+    blank = raw <= 32
+    starts = ~blank
+    starts[1:] &= blank[:-1]
+    line_of_token = np.cumsum(raw == 10, dtype=np.int32)[starts]
+    per_line = np.bincount(line_of_token)
+    per_line = per_line[per_line > 0]
+    if per_line.size == num_papers + 1 and per_line[0] == 3:
+        counts = per_line[1:] - 1
+        first = 3 + np.concatenate(([0], np.cumsum(per_line[1:])[:-1]))
+        if np.array_equal(tokens[first], counts):
+            return counts
+    # Not one paper per line, follow the counts token by token
+    counts = np.empty(num_papers, dtype=np.int64)
+    pos = 3
+    for i in range(num_papers):
+        if pos >= tokens.size:
+            raise ValueError(f"Instance ends before paper {i + 1}")
+        counts[i] = tokens[pos]
+        pos += int(counts[i]) + 1
+    if pos > tokens.size:
+        raise ValueError(f"Instance ends inside paper {num_papers}")
+    return counts
+
+def _write_cache(path, instance):
+    num_papers, num_reviewers, reviews_per_paper, indptr, indices = instance
+    header = np.zeros(1, dtype=CACHE_HEADER)
+    header[0] = (CACHE_MAGIC, 0, num_papers, num_reviewers, reviews_per_paper, len(indices))
+    # Written next to its final name and renamed, concurrent runs never see half a file
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header.tobytes())
+            f.write(np.ascontiguousarray(indptr, dtype=np.int32).tobytes())
+            f.write(np.ascontiguousarray(indices, dtype=np.int32).tobytes())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def _map_cache(path):
+    # The instance in the cache file at path as views on a private mapping (writes stay in
+    # this process), None when the file is missing or not a complete cache file
+    try:
+        with open(path, 'rb') as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError):
+        return None
+    if len(buf) < CACHE_HEADER.itemsize:
+        return None
+    header = np.frombuffer(buf, dtype=CACHE_HEADER, count=1)[0]
+    num_papers, num_edges = int(header['num_papers']), int(header['num_edges'])
+    if header['magic'] != CACHE_MAGIC or len(buf) != CACHE_HEADER.itemsize + 4 * (num_papers + 1 + num_edges):
+        return None
+    indptr = np.frombuffer(buf, dtype=np.int32, count=num_papers + 1, offset=CACHE_HEADER.itemsize)
+    indices = np.frombuffer(buf, dtype=np.int32, count=num_edges, offset=CACHE_HEADER.itemsize + 4 * (num_papers + 1))
+    return num_papers, int(header['num_reviewers']), int(header['reviews_per_paper']), indptr, indices
+
+def _cached_parse(digest, buf):
+    # Parses buf through the cache entry of digest, buf is a callable returning the text
+    path = os.path.join(CACHE_DIR, f"{digest}.bin")
+    instance = _map_cache(path)
+    if instance is None:
+        instance = parse_instance(buf())
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            _write_cache(path, instance)
+        except OSError:
+            # Read-only or full cache directory, the instance was parsed anyway
+            pass
+    return instance
+
+def _file_digest(path):
+    # sha256 of the file at path, streamed so a cache hit never holds the whole text
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+def read_instance(path='input.txt', cache=True):
+    if not cache or not CACHE_DIR:
+        return parse_instance(_read_bytes(path))
+    return _cached_parse(_file_digest(path), lambda: _read_bytes(path))
+
+def read_instance_stdin(cache=True):
+    buf = sys.stdin.buffer.read()
+    if not cache or not CACHE_DIR:
+        return parse_instance(buf)
+    return _cached_parse(hashlib.sha256(buf).hexdigest(), lambda: buf)
+
+def instance_hash(num_papers, num_reviewers, reviews_per_paper, indptr, indices):
+    # Content hash of the parsed instance, the same for every text layout of the same papers
+    digest = hashlib.sha256(np.array([num_papers, num_reviewers, reviews_per_paper], dtype=np.int64).tobytes())
+    digest.update(np.ascontiguousarray(indptr, dtype=np.int32).tobytes())
+    digest.update(np.ascontiguousarray(indices, dtype=np.int32).tobytes())
+    return digest.hexdigest()
+
+def load_bounds(num_papers, num_reviewers, reviews_per_paper, indices):
+    # (low, high) bracket of the optimal max load. Dirichlet: some reviewer gets at least
+    # ceil(P*K/R) papers. No reviewer can take more papers than it is willing to review,
+    # so a feasible instance never needs more than the max reviewer degree.
+    low = (num_papers * reviews_per_paper + num_reviewers - 1) // num_reviewers if num_reviewers else 0
+    high = int(np.bincount(indices, minlength=num_reviewers + 1)[1:].max()) if num_reviewers else 0
+    return low, high
+
+def selected_from_mask(num_papers, reviews_per_paper, indices, chosen):
+    # (num_papers, K) array of the 1-based reviewers of a bool mask over the CSR edges that
+    # picks exactly K edges per paper, every row in CSR order
+    return indices[chosen].reshape(num_papers, reviews_per_paper)
+
+def reviewer_edges(num_reviewers, indptr, indices):
+    # CSR edge ids grouped by reviewer: the edges of reviewer r (1-based) are
+    # edges[rev_indptr[r-1]:rev_indptr[r]], in increasing paper order
+    rev_indptr = np.zeros(num_reviewers + 1, dtype=np.int32)
+    np.cumsum(np.bincount(indices, minlength=num_reviewers + 1)[1:], out=rev_indptr[1:])
+    # Stable, so papers keep their CSR (increasing) order inside every reviewer
+    edges = np.argsort(indices, kind='stable').astype(np.int32)
+    return rev_indptr, edges
+
+def transpose(num_reviewers, indptr, indices):
+    # CSC view of the same edges: the papers willing to be reviewed by reviewer r (1-based)
+    # are rev_indices[rev_indptr[r-1]:rev_indptr[r]], in increasing paper order
+    num_papers = len(indptr) - 1
+    rev_indptr, edges = reviewer_edges(num_reviewers, indptr, indices)
+    paper_of_edge = np.repeat(np.arange(1, num_papers + 1, dtype=np.int32), np.diff(indptr))
+    rev_indices = paper_of_edge[edges]
+    return rev_indptr, rev_indices
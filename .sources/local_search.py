@@ -1,115 +1,248 @@
+import argparse
+import sys
 import time
 import random
-def time_execution(func):
-    def wrapper(*args, **kwargs):
-        start_time = time.time()
-        result = func(*args, **kwargs)
-        end_time = time.time()
-        execution_time = end_time - start_time
-        print(f"{execution_time:.4f}")
-        return result
-    return wrapper
-
-
-def reverse_dict(willing_reviewers):
-    willing_papers = {}
-    for paper, reviewers in willing_reviewers.items():
-        for reviewer in reviewers:
-            if reviewer not in willing_papers:
-                willing_papers[reviewer] = []
-            willing_papers[reviewer].append(paper)
-    return willing_papers
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
+from instance_io import load_bounds, read_instance
+from paper_assignment import time_execution
+from greedy import greedy_assign
+
 
 def input_data():
-    with open('input.txt', 'r') as f:
-        num_papers,num_reviewers,reviews_per_paper = map(int, f.readline().strip().split())
-        willing_reviewers = {}
-        for i in range(num_papers):
-            line = list(map(int, f.readline().strip().split()))
-            paper_id = i+1
-            reviewers = line[1:]
-            willing_reviewers[paper_id] = reviewers
-        #Crate a 
-        willing_papers = {}
-        for i in range(1,num_reviewers+1):
-            for j in range(1,num_papers+1):
-                if i in willing_reviewers[j]:
-                    willing_papers[i] = willing_papers.get(i, []) + [j]
-        #print(willing_papers)
-    return num_papers, num_reviewers, reviews_per_paper, willing_reviewers, willing_papers
-
-def matching_papers(num_papers, num_reviewers, reviews_per_paper, willing_reviewers):
-    load = {i: 0 for i in range(1, num_reviewers + 1)}  # Fixed: Start from 1 instead of 0
-    sorted_dict = dict(sorted(willing_reviewers.items(), key=lambda item: len(item[1])))
-    selected_reviewers = {}
-    for paper,reviewers in sorted_dict.items():
-        #Sort the reviewers by their current load
-        reviewers.sort(key=lambda x: load[x])
-        # Select the first K reviewers
-        selected_reviewers[paper] = reviewers[:reviews_per_paper]
-        # Update the load of the selected reviewers
-        for reviewer in selected_reviewers[paper]:
-            load[reviewer] += 1
-    # Find the maximum load
-    max_load = max(load.values())
-    return max_load, selected_reviewers, load
-
-def local_search(num_papers, num_reviewers, reviews_per_paper, willing_papers, assigned_papers, current_load, depth=0):
-    if depth > 100:  # Limit recursion depth
-        return assigned_papers, current_load
-    
-    changed = False
-    sorted_load = dict(sorted(current_load.items(), key=lambda item: item[1]))
-    #get the max load
-    reviewer_of_max_load = max(current_load, key=current_load.get)
-    max_load = current_load[reviewer_of_max_load]
-    
-    for candidate in sorted_load.keys():
-        if sorted_load[candidate] < max_load-1:
-            # Ensure both reviewers exist in the dictionaries
-            if candidate not in willing_papers:
-                willing_papers[candidate] = []
-            if reviewer_of_max_load not in assigned_papers:
-                continue
-                
-            available_papers = list(set(willing_papers.get(candidate, [])) & set(assigned_papers[reviewer_of_max_load]))
-            if len(available_papers) > 0:
-                random_paper = random.choice(available_papers)
-                assigned_papers[candidate].append(random_paper)
-                assigned_papers[reviewer_of_max_load].remove(random_paper)
-                # Update the load
-                current_load[candidate] += 1
-                current_load[reviewer_of_max_load] -= 1
-                changed=True
+    return read_instance('input.txt')
+
+class SearchState:
+    # Assignment indexes kept in sync by every move:
+    #   paper_reviewers[p]  reviewers assigned to paper p
+    #   assigned[r]         papers assigned to reviewer r
+    #   buckets[l]          reviewers whose load is l
+    def __init__(self, num_reviewers, indptr, indices, selected):
+        self.willing = indices.tolist()
+        self.bounds = indptr.tolist()
+        self.paper_reviewers = [set(row) for row in selected.tolist()]
+        for reviewers in self.paper_reviewers:
+            reviewers.discard(0)
+        self.assigned = [set() for _ in range(num_reviewers + 1)]
+        for paper, reviewers in enumerate(self.paper_reviewers):
+            for reviewer in reviewers:
+                self.assigned[reviewer].add(paper)
+        self.load = [len(papers) for papers in self.assigned]
+        self.buckets = {}
+        for reviewer in range(1, num_reviewers + 1):
+            self.buckets.setdefault(self.load[reviewer], set()).add(reviewer)
+        self.max_load = max(self.load[1:], default=0)
+        self.moves = 0
+
+    def willing_reviewers(self, paper):
+        return self.willing[self.bounds[paper]:self.bounds[paper + 1]]
+
+    def _set_load(self, reviewer, load):
+        self.buckets[self.load[reviewer]].discard(reviewer)
+        self.load[reviewer] = load
+        self.buckets.setdefault(load, set()).add(reviewer)
+
+    def move(self, paper, source, target):
+        self.paper_reviewers[paper].remove(source)
+        self.paper_reviewers[paper].add(target)
+        self.assigned[source].remove(paper)
+        self.assigned[target].add(paper)
+        self._set_load(source, self.load[source] - 1)
+        self._set_load(target, self.load[target] + 1)
+        # A chain passes its papers through reviewers that may sit at the max, they go one
+        # above it until their own paper leaves
+        if self.load[target] > self.max_load:
+            self.max_load = self.load[target]
+        while self.max_load > 0 and not self.buckets.get(self.max_load):
+            self.max_load -= 1
+
+    def selected(self, reviews_per_paper):
+        return [sorted(reviewers) + [0] * (reviews_per_paper - len(reviewers)) for reviewers in self.paper_reviewers]
+
+def selected_max_load(num_reviewers, selected):
+    # Max load of a (P, K) assignment counted from the reviewers themselves, what the callers
+    # report and bound the exact models with, independent of the search bookkeeping
+    return int(np.bincount(selected.ravel(), minlength=num_reviewers + 1)[1:].max(initial=0))
+
+def find_transfer(state, reviewer, rng):
+    # A paper of `reviewer` that a willing reviewer at least two below the max can take over
+    limit = state.max_load - 2
+    papers = list(state.assigned[reviewer])
+    # Random starting point instead of a full shuffle, so seeds still give different runs
+    start = rng.randrange(len(papers)) if papers else 0
+    for paper in papers[start:] + papers[:start]:
+        best = None
+        for candidate in state.willing_reviewers(paper):
+            if state.load[candidate] <= limit and candidate not in state.paper_reviewers[paper]:
+                if best is None or state.load[candidate] < state.load[best]:
+                    best = candidate
+        if best is not None:
+            return paper, best
+    return None
+
+def find_chain(state, reviewer, max_depth):
+    # Ejection chain: BFS over "reviewer -> one of its papers -> another willing reviewer of
+    # that paper" edges, up to max_depth transfers. Every reviewer inside the chain gives one
+    # paper and takes one, so only the last one gains load and it must be two below the max.
+    # Returns the transfers as (paper, from, to) in order, or None.
+    limit = state.max_load - 2
+    parent = {reviewer: None}
+    frontier = [reviewer]
+    for _ in range(max_depth):
+        next_frontier = []
+        for source in frontier:
+            for paper in state.assigned[source]:
+                reviewers_of_paper = state.paper_reviewers[paper]
+                for candidate in state.willing_reviewers(paper):
+                    if candidate in parent or candidate in reviewers_of_paper:
+                        continue
+                    parent[candidate] = (source, paper)
+                    if state.load[candidate] <= limit:
+                        chain = []
+                        while parent[candidate] is not None:
+                            source, paper = parent[candidate]
+                            chain.append((paper, source, candidate))
+                            candidate = source
+                        chain.reverse()
+                        return chain
+                    next_frontier.append(candidate)
+        frontier = next_frontier
+    return None
+
+def local_search_steps(state, time_limit=None, seed=None, chain_depth=4, max_moves=None):
+    # Anytime local search. Moves papers off the max loaded reviewers until one of them has
+    # neither a transfer nor an ejection chain of at most chain_depth transfers left, or the
+    # wall-clock / move budget runs out. A transfer or a whole chain never raises the max, so
+    # the live state is always the best assignment so far: (max_load, state) is yielded at
+    # the start and after every drop of the max, and the caller may stop iterating at any yield.
+    rng = random.Random(seed)
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    moves = 0
+    yield state.max_load, state
+    while state.max_load > 0:
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        if max_moves is not None and moves >= max_moves:
+            break
+        max_load = state.max_load
+        reviewer = next(iter(state.buckets[max_load]))
+        transfer = find_transfer(state, reviewer, rng)
+        if transfer is not None:
+            paper, candidate = transfer
+            state.move(paper, reviewer, candidate)
+        else:
+            chain = find_chain(state, reviewer, chain_depth) if chain_depth > 1 else None
+            if chain is None:
                 break
-                
-    if changed:
-        return local_search(num_papers, num_reviewers, reviews_per_paper, willing_papers, assigned_papers, current_load, depth+1)
+            for paper, source, target in chain:
+                state.move(paper, source, target)
+        moves += 1
+        state.moves += 1
+        if state.max_load < max_load:
+            yield state.max_load, state
+
+def local_search(state, time_limit=None, seed=None, chain_depth=4, max_moves=None, on_improve=None):
+    # Runs local_search_steps to the end, calling on_improve(max_load, state) on every
+    # improvement. Returns the number of moves made.
+    moves = state.moves
+    for max_load, _ in local_search_steps(state, time_limit, seed, chain_depth, max_moves):
+        if on_improve is not None:
+            on_improve(max_load, state)
+    return state.moves - moves
 
-    return assigned_papers, current_load
+# Instance arrays of a multi-start worker, attached once from shared memory by _attach_instance
+_instance = {}
 
-@time_execution             
+def _attach_instance(specs):
+    for key, (name, shape, dtype) in specs.items():
+        # Pool workers share the parent's resource tracker, the parent unlinks the blocks
+        block = shared_memory.SharedMemory(name=name)
+        _instance[key] = (block, np.ndarray(shape, dtype=dtype, buffer=block.buf))
+
+def _run_start(num_reviewers, reviews_per_paper, seed, time_limit, chain_depth):
+    indptr = _instance['indptr'][1]
+    indices = _instance['indices'][1]
+    _, selected = greedy_assign(num_reviewers, reviews_per_paper, indptr, indices, seed=seed)
+    state = SearchState(num_reviewers, indptr, indices, selected)
+    local_search(state, time_limit, seed, chain_depth)
+    selected = np.array(state.selected(reviews_per_paper), dtype=np.int32)
+    return selected_max_load(num_reviewers, selected), seed, selected
+
+def multi_start(num_reviewers, reviews_per_paper, indptr, indices, starts=4, workers=None,
+                time_limit=None, chain_depth=4, seed=0):
+    # Runs `starts` seeded greedy + local search trajectories in a process pool and returns
+    # (max_load, seed, selected) of the best one. The instance arrays are copied once into
+    # shared memory and every worker maps them, tasks only carry their seed.
+    num_papers = len(indptr) - 1
+    lower_bound, _ = load_bounds(num_papers, num_reviewers, reviews_per_paper, indices)
+    blocks = []
+    try:
+        specs = {}
+        for key, array in (('indptr', indptr), ('indices', indices)):
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks.append(block)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            specs[key] = (block.name, array.shape, array.dtype.str)
+
+        best = None
+        with ProcessPoolExecutor(workers, initializer=_attach_instance, initargs=(specs,)) as pool:
+            futures = [pool.submit(_run_start, num_reviewers, reviews_per_paper, seed + i, time_limit, chain_depth)
+                       for i in range(starts)]
+            for future in as_completed(futures):
+                result = future.result()
+                if best is None or result[:2] < best[:2]:
+                    best = result
+                if best[0] <= lower_bound:
+                    # Nothing can beat the Dirichlet bound, drop the trajectories not started yet
+                    for other in futures:
+                        other.cancel()
+                    break
+        return best
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Greedy + local search paper-reviewer assignment on input.txt.")
+    parser.add_argument('--time-limit', type=float, default=None, help="wall-clock budget of the local search in seconds")
+    parser.add_argument('--max-moves', type=int, default=None, help="budget of moves (a transfer or a whole chain)")
+    parser.add_argument('--progress', action='store_true', help="report every improvement of the max load on stderr")
+    parser.add_argument('--seed', type=int, default=None, help="seed of the random paper order")
+    parser.add_argument('--chain-depth', type=int, default=4,
+                        help="longest ejection chain (in transfers) tried when no single transfer exists, 1 disables chains")
+    parser.add_argument('--starts', type=int, default=1,
+                        help="number of seeded greedy + local search trajectories, more than 1 runs them in a process pool")
+    parser.add_argument('--workers', type=int, default=None, help="process pool size for --starts (default: all cores)")
+    return parser.parse_args()
+
+@time_execution
 def main():
-    num_papers, num_reviewers, reviews_per_paper, willing_reviewers, willing_papers = input_data()
-
-    max_load, selected_reviewers, current_load = matching_papers(num_papers, num_reviewers, reviews_per_paper, willing_reviewers)
-    
-    # Calculate assigned papers for each reviewer
-    assigned_papers = reverse_dict(selected_reviewers)
-    
-    # Update willing papers by removing already assigned papers
-    reviewer_willing_papers = {}
-    for i in range(1, num_reviewers+1):
-        if i in willing_papers:
-            reviewer_willing_papers[i] = list(set(willing_papers[i]) - set(assigned_papers.get(i, [])))
-    
+    args = parse_args()
+    num_papers, num_reviewers, reviews_per_paper, indptr, indices = input_data()
+
+    if args.starts > 1:
+        max_load, seed, selected = multi_start(num_reviewers, reviews_per_paper, indptr, indices, args.starts,
+                                               args.workers, args.time_limit, args.chain_depth, args.seed or 0)
+        print(f"{max_load}")
+        return
+
+    _, selected = greedy_assign(num_reviewers, reviews_per_paper, indptr, indices)
+
     # Perform local search
-    optimized_assignments, final_load = local_search(num_papers, num_reviewers, reviews_per_paper, reviewer_willing_papers, assigned_papers, current_load)
-    selected_reviewers=reverse_dict(optimized_assignments)
+    state = SearchState(num_reviewers, indptr, indices, selected)
+    start_time = time.time()
+
+    def report(max_load, state):
+        print(f"max_load {max_load} after {state.moves} moves, {time.time() - start_time:.4f}s", file=sys.stderr)
+
+    local_search(state, args.time_limit, args.seed, args.chain_depth, args.max_moves,
+                 on_improve=report if args.progress else None)
     """print(num_papers)
-    for paper, reviewers in selected_reviewers.items():
-        print(f"{reviews_per_paper} {' '.join(map(str, reviewers))}")"""
-    print(f"{max(final_load.values())}")
-    
+    for reviewers in state.selected(reviews_per_paper):
+        print(f"{reviews_per_paper} {' '.join(str(r) for r in reviewers if r)}")"""
+    print(f"{state.max_load}")
+
 if __name__ == "__main__":
     main()
@@ -1,61 +1,30 @@
-import subprocess
+import generate
+from batch import run_instance
 
 
 def main():
     # generate.py is used to generate the data files
-    file = "generate.py"
-    print(f"Running: {file}")
-    try:
-        result = subprocess.run(["python", file], capture_output=True, text=True)
-        print("Output:")
-        print(result.stdout)
-        if result.stderr:
-            print("Errors:")
-            print(result.stderr)
-    except Exception as e:
-        print(f"Error executing {file}: {e}")
-    print("-" * 60)
-    
-    # check matching
-    file = "check_matching.py"
-    print(f"Running: {file}")
-    try:
-        result = subprocess.run(["python", file], capture_output=True, text=True)
-        print("Output:")
-        print(result.stdout)
-        line=[line.strip() for line in result.stdout.splitlines()]
-        if line[-2] != "Matching is possible":
-            print("Matching check failed. Stopping execution.")
-            return
-    except Exception as e:
-        print(f"Error executing {file}: {e}")
-        return
+    print("Running: generate.py")
+    generate.generate_test_case()
     print("-" * 60)
 
-    # List of files to run
-    selected_files = [
-        "MIP.py",
-        "cp.py",
-        "max_flow.py",
-        "greedy.py",
-        "local_search.py",
-        "LP.py",
-    ]
-
+    # Every solver runs in this process on the instance read once, after the matching check
     print("Running all paper-reviewer assignment implementations...")
     print("=" * 60)
+    results = run_instance('input.txt')
+    if all(result['status'] == 'INFEASIBLE' for result in results):
+        print("Matching check failed. Stopping execution.")
+        return
 
-    for file in selected_files:
-        print(f"Running: {file}")
-        try:
-            result = subprocess.run(["python", file], capture_output=True, text=True)
-            print("Output:")
-            print(result.stdout)
-            if result.stderr:
-                print("Errors:")
-                print(result.stderr)
-        except Exception as e:
-            print(f"Error executing {file}: {e}")
+    for result in results:
+        print(f"Running: {result['solver']}")
+        print("Output:")
+        print(result['max_load'])
+        if result['time'] is not None:
+            print(f"{result['time']:.4f}")
+        if result['status'] not in ('OPTIMAL', 'FEASIBLE'):
+            print("Errors:")
+            print(result['status'])
         print("-" * 60)
 
     print("All executions completed.")
@@ -63,4 +32,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,154 @@
+import numpy as np
+from ortools.linear_solver import pywraplp
+from ortools.sat.python import cp_model
+
+from instance_io import load_bounds, reviewer_edges
+
+# Shared construction of the MIP.py, LP.py and cp.py models. There is one variable per
+# willing (paper, reviewer) pair, stored in a list in CSR edge order, so the variables of
+# paper p (1-based) are x[indptr[p-1]:indptr[p]]. The per-reviewer lists are gathered once
+# through the transposed edge order, and every row is a single Sum over a prebuilt list.
+# Building is linear in the number of edges.
+#
+# compact=True drops the load variables and their equality rows: each reviewer gets a
+# single sum(x[., r]) <= max_load row, max_load lives in [ceil(P*K/R), max degree], and
+# reviewers whose degree is at most the lower bound get no row at all (it can never bind).
+
+MP_STATUS_NAMES = {
+    pywraplp.Solver.OPTIMAL: 'OPTIMAL',
+    pywraplp.Solver.FEASIBLE: 'FEASIBLE',
+    pywraplp.Solver.INFEASIBLE: 'INFEASIBLE',
+    pywraplp.Solver.UNBOUNDED: 'UNBOUNDED',
+    pywraplp.Solver.ABNORMAL: 'ABNORMAL',
+    pywraplp.Solver.MODEL_INVALID: 'MODEL_INVALID',
+    pywraplp.Solver.NOT_SOLVED: 'NOT_SOLVED',
+}
+
+def edge_names(num_papers, indptr, indices):
+    papers = np.repeat(np.arange(1, num_papers + 1), np.diff(indptr)).tolist()
+    return [f'x[{paper},{reviewer}]' for paper, reviewer in zip(papers, indices.tolist())]
+
+def paper_groups(indptr, x):
+    bounds = indptr.tolist()
+    return [x[bounds[paper]:bounds[paper + 1]] for paper in range(len(bounds) - 1)]
+
+def reviewer_groups(num_reviewers, indptr, indices, x):
+    rev_indptr, edges = reviewer_edges(num_reviewers, indptr, indices)
+    bounds = rev_indptr.tolist()
+    edges = edges.tolist()
+    return [[x[e] for e in edges[bounds[reviewer]:bounds[reviewer + 1]]] for reviewer in range(num_reviewers)]
+
+def build_linear_model(solver, num_papers, num_reviewers, reviews_per_paper, indptr, indices, integer=True,
+                       compact=False):
+    # pywraplp model (SCIP for MIP.py, any LP backend for LP.py with integer=False).
+    # Returns (x, loads, max_load), loads[0] is unused and loads is None when compact.
+    names = edge_names(num_papers, indptr, indices)
+    if integer:
+        x = [solver.BoolVar(name) for name in names]
+    else:
+        x = [solver.NumVar(0, 1, name) for name in names]
+    new_var = solver.IntVar if integer else solver.NumVar
+
+    for variables in paper_groups(indptr, x):
+        solver.Add(solver.Sum(variables) == reviews_per_paper)
+
+    if compact:
+        low, high = load_bounds(num_papers, num_reviewers, reviews_per_paper, indices)
+        max_load = new_var(low, max(low, high), 'max_load')
+        for variables in reviewer_groups(num_reviewers, indptr, indices, x):
+            if len(variables) > low:
+                solver.Add(solver.Sum(variables) <= max_load)
+        solver.Minimize(max_load)
+        return x, None, max_load
+
+    max_load = new_var(0, num_papers, 'max_load')
+    loads = [None]
+    for reviewer, variables in enumerate(reviewer_groups(num_reviewers, indptr, indices, x), 1):
+        load = new_var(0, num_papers, f'load[{reviewer}]')
+        solver.Add(load == solver.Sum(variables))
+        solver.Add(load <= max_load)
+        loads.append(load)
+
+    solver.Minimize(max_load)
+    return x, loads, max_load
+
+def build_cp_model(num_papers, num_reviewers, reviews_per_paper, indptr, indices, compact=False):
+    # CP-SAT model. Returns (model, x, loads, max_load), loads[0] is unused and loads is
+    # None when compact.
+    model = cp_model.CpModel()
+    x = [model.NewBoolVar(name) for name in edge_names(num_papers, indptr, indices)]
+
+    for variables in paper_groups(indptr, x):
+        model.Add(cp_model.LinearExpr.Sum(variables) == reviews_per_paper)
+
+    if compact:
+        low, high = load_bounds(num_papers, num_reviewers, reviews_per_paper, indices)
+        max_load = model.NewIntVar(low, max(low, high), 'max_load')
+        for variables in reviewer_groups(num_reviewers, indptr, indices, x):
+            if len(variables) > low:
+                model.Add(cp_model.LinearExpr.Sum(variables) <= max_load)
+        model.Minimize(max_load)
+        return model, x, None, max_load
+
+    max_load = model.NewIntVar(0, num_papers, 'max_load')
+    loads = [None]
+    for reviewer, variables in enumerate(reviewer_groups(num_reviewers, indptr, indices, x), 1):
+        load = model.NewIntVar(0, num_papers, f'load[{reviewer}]')
+        model.Add(load == cp_model.LinearExpr.Sum(variables))
+        model.Add(load <= max_load)
+        loads.append(load)
+
+    model.Minimize(max_load)
+    return model, x, loads, max_load
+
+# Aggregated models over the equivalence classes of symmetry.Aggregation: one integer count
+# per (paper class, reviewer class) edge, compact rows only. A paper class of m papers needs
+# m*K reviews and a reviewer class of s reviewers can absorb s*max_load of them.
+
+def aggregated_groups(aggregation, y):
+    bounds = aggregation.class_indptr.tolist()
+    by_paper_class = [y[bounds[q]:bounds[q + 1]] for q in range(len(bounds) - 1)]
+    by_reviewer_class = [[] for _ in aggregation.reviewer_sizes]
+    for e, c in enumerate(aggregation.class_indices.tolist()):
+        by_reviewer_class[c].append(y[e])
+    # A reviewer of class c is willing to review every paper of the paper classes next to c
+    paper_class_of_edge = np.repeat(np.arange(len(bounds) - 1), np.diff(aggregation.class_indptr))
+    degrees = np.bincount(aggregation.class_indices, weights=aggregation.paper_sizes[paper_class_of_edge],
+                          minlength=len(aggregation.reviewer_sizes))
+    return by_paper_class, by_reviewer_class, degrees.tolist()
+
+def aggregated_bounds(aggregation, reviews_per_paper):
+    paper_class_of_edge = np.repeat(np.arange(len(aggregation.paper_sizes)), np.diff(aggregation.class_indptr))
+    upper = aggregation.paper_sizes[paper_class_of_edge] * np.minimum(aggregation.reviewer_sizes[aggregation.class_indices],
+                                                                      reviews_per_paper)
+    return upper.tolist()
+
+def build_aggregated_linear_model(solver, aggregation, reviews_per_paper, low, high, integer=True):
+    # Returns (y, max_load), y in the order of the class graph edges
+    new_var = solver.IntVar if integer else solver.NumVar
+    y = [new_var(0, upper, f'y[{e}]') for e, upper in enumerate(aggregated_bounds(aggregation, reviews_per_paper))]
+    by_paper_class, by_reviewer_class, degrees = aggregated_groups(aggregation, y)
+    for size, variables in zip(aggregation.paper_sizes.tolist(), by_paper_class):
+        solver.Add(solver.Sum(variables) == size * reviews_per_paper)
+
+    max_load = new_var(low, max(low, high), 'max_load')
+    for size, variables, degree in zip(aggregation.reviewer_sizes.tolist(), by_reviewer_class, degrees):
+        if degree > low:
+            solver.Add(solver.Sum(variables) <= size * max_load)
+    solver.Minimize(max_load)
+    return y, max_load
+
+def build_aggregated_cp_model(aggregation, reviews_per_paper, low, high):
+    # Returns (model, y, max_load), y in the order of the class graph edges
+    model = cp_model.CpModel()
+    y = [model.NewIntVar(0, upper, f'y[{e}]') for e, upper in enumerate(aggregated_bounds(aggregation, reviews_per_paper))]
+    by_paper_class, by_reviewer_class, degrees = aggregated_groups(aggregation, y)
+    for size, variables in zip(aggregation.paper_sizes.tolist(), by_paper_class):
+        model.Add(cp_model.LinearExpr.Sum(variables) == size * reviews_per_paper)
+
+    max_load = model.NewIntVar(low, max(low, high), 'max_load')
+    for size, variables, degree in zip(aggregation.reviewer_sizes.tolist(), by_reviewer_class, degrees):
+        if degree > low:
+            model.Add(cp_model.LinearExpr.Sum(variables) <= size * max_load)
+    model.Minimize(max_load)
+    return model, y, max_load
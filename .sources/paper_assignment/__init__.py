@@ -0,0 +1,4 @@
+from paper_assignment.core import (Assignment, Instance, get_solver, register, solve, solver_names,
+                                   time_execution)
+
+__all__ = ['Assignment', 'Instance', 'get_solver', 'register', 'solve', 'solver_names', 'time_execution']
@@ -0,0 +1,156 @@
+import importlib
+import sys
+import time
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:
+    # Windows
+    resource = None
+
+from instance_io import instance_hash, parse_instance, read_instance
+
+# Common types of the assignment algorithms. Every algorithm is a plugin registered under a
+# name: a function taking an Instance (plus keyword options) and returning an Assignment.
+# The plugins live in paper_assignment.plugins and are imported on the first registry
+# lookup, so the solver scripts can import this module without a cycle.
+
+def time_execution(func):
+    def wrapper(*args, **kwargs):
+        start_time = time.time()
+        result = func(*args, **kwargs)
+        end_time = time.time()
+        execution_time = end_time - start_time
+        print(f"{execution_time:.4f}")
+        return result
+    return wrapper
+
+class Instance:
+    # One parsed instance, the willing reviewers of paper p (1-based) are
+    # indices[indptr[p-1]:indptr[p]]
+    def __init__(self, num_papers, num_reviewers, reviews_per_paper, indptr, indices, name=None):
+        self.num_papers = num_papers
+        self.num_reviewers = num_reviewers
+        self.reviews_per_paper = reviews_per_paper
+        self.indptr = indptr
+        self.indices = indices
+        self.name = name
+
+    @classmethod
+    def from_file(cls, path='input.txt'):
+        return cls(*read_instance(path), name=path)
+
+    @classmethod
+    def from_buffer(cls, buf, name=None):
+        return cls(*parse_instance(buf), name=name)
+
+    def arrays(self):
+        # The (num_papers, num_reviewers, reviews_per_paper, indptr, indices) tuple the
+        # solver functions take
+        return self.num_papers, self.num_reviewers, self.reviews_per_paper, self.indptr, self.indices
+
+    def num_edges(self):
+        return len(self.indices)
+
+    def content_hash(self):
+        return instance_hash(*self.arrays())
+
+class Assignment:
+    # Result of a plugin. max_load is None when no assignment was found, selected is the
+    # (num_papers, K) array of 1-based reviewers when the algorithm produces one, stats holds
+    # algorithm specific figures, time the wall-clock seconds of the plugin call and
+    # peak_memory how far the resident set size of the process rose above its value at the
+    # start of the call, in KiB.
+    def __init__(self, max_load, status, selected=None, stats=None):
+        self.max_load = max_load
+        self.status = status
+        self.selected = selected
+        self.stats = stats or {}
+        self.time = None
+        self.peak_memory = None
+
+    def feasible(self):
+        return self.max_load is not None
+
+    def loads(self, num_reviewers):
+        return np.bincount(self.selected.ravel(), minlength=num_reviewers + 1)[1:]
+
+    def as_dict(self):
+        return {'max_load': self.max_load, 'status': self.status, 'time': self.time,
+                'peak_memory': self.peak_memory, **self.stats}
+
+    def write(self, stream=None):
+        # Output format of the assignment scripts, in one write
+        stream = stream or sys.stdout
+        num_papers, reviews_per_paper = self.selected.shape
+        lines = [str(num_papers)]
+        lines += [f"{reviews_per_paper} {' '.join(str(r) for r in row if r)}" for row in self.selected.tolist()]
+        stream.write('\n'.join(lines) + '\n')
+
+_SOLVERS = {}
+
+def register(name):
+    def decorator(func):
+        _SOLVERS[name] = func
+        return func
+    return decorator
+
+def _load_plugins():
+    importlib.import_module('paper_assignment.plugins')
+
+def solver_names():
+    _load_plugins()
+    return list(_SOLVERS)
+
+def get_solver(name):
+    _load_plugins()
+    if name not in _SOLVERS:
+        raise KeyError(f"Unknown solver {name!r}, available: {', '.join(_SOLVERS)}")
+    return _SOLVERS[name]
+
+def _status_kib(field):
+    # VmRSS / VmHWM of the process in KiB, None off Linux
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+def _max_rss():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports it in bytes
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+def _memory_mark():
+    # Linux resets the VmHWM high-water mark on a write of 5 to clear_refs, the peak of the
+    # call is then measured from the current RSS. Elsewhere only the growth of the peak of
+    # the whole process is known.
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return _status_kib('VmRSS'), True
+    except OSError:
+        return _max_rss(), False
+
+def _peak_growth(mark):
+    start, reset = mark
+    peak = _status_kib('VmHWM') if reset else _max_rss()
+    if start is None or peak is None:
+        return None
+    return max(peak - start, 0)
+
+def solve(name, instance, **options):
+    solver = get_solver(name)
+    mark = _memory_mark()
+    start_time = time.perf_counter()
+    assignment = solver(instance, **options)
+    assignment.time = time.perf_counter() - start_time
+    assignment.peak_memory = _peak_growth(mark)
+    return assignment
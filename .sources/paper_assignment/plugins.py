@@ -0,0 +1,78 @@
+import numpy as np
+
+import LP
+import MIP
+import cp
+from greedy import greedy_assign
+from local_search import SearchState, local_search, multi_start, selected_max_load
+from flow_network import search_max_load, selected_reviewers
+from parametric_flow import parametric_max_load
+from paper_assignment.core import Assignment, register
+
+# The algorithms of the solver scripts behind the common plugin interface. Keyword options
+# are the ones of the underlying solve function, with the script defaults.
+
+@register('greedy')
+def greedy_plugin(instance, batch_size=0, seed=None):
+    load, selected = greedy_assign(instance.num_reviewers, instance.reviews_per_paper, instance.indptr,
+                                   instance.indices, batch_size, seed)
+    if instance.num_papers and selected.min() == 0:
+        return Assignment(None, 'INCOMPLETE', selected)
+    return Assignment(int(load[1:].max(initial=0)), 'FEASIBLE', selected)
+
+@register('local_search')
+def local_search_plugin(instance, time_limit=None, seed=None, chain_depth=4, max_moves=None, starts=1, workers=None):
+    num_reviewers, reviews_per_paper = instance.num_reviewers, instance.reviews_per_paper
+    if starts > 1:
+        max_load, seed, selected = multi_start(num_reviewers, reviews_per_paper, instance.indptr, instance.indices,
+                                               starts, workers, time_limit, chain_depth, seed or 0)
+        return Assignment(max_load, 'FEASIBLE', selected, {'seed': seed})
+    _, selected = greedy_assign(num_reviewers, reviews_per_paper, instance.indptr, instance.indices)
+    if instance.num_papers and selected.min() == 0:
+        return Assignment(None, 'INCOMPLETE', selected)
+    state = SearchState(num_reviewers, instance.indptr, instance.indices, selected)
+    moves = local_search(state, time_limit, seed, chain_depth, max_moves)
+    selected = np.array(state.selected(reviews_per_paper), dtype=np.int32).reshape(-1, reviews_per_paper)
+    return Assignment(selected_max_load(num_reviewers, selected), 'FEASIBLE', selected, {'moves': moves})
+
+def _flow_assignment(instance, search):
+    max_load, edge_flows, num_solves = search_max_load(*instance.arrays(), search)
+    if max_load is None:
+        return Assignment(None, 'INFEASIBLE', stats={'flow_solves': num_solves})
+    selected = selected_reviewers(instance.num_papers, instance.reviews_per_paper, instance.indices, edge_flows)
+    return Assignment(max_load, 'OPTIMAL', selected, {'flow_solves': num_solves})
+
+@register('max_flow')
+def max_flow_plugin(instance):
+    # +1 scan from the lower bound, as max_flow.py
+    return _flow_assignment(instance, 'linear')
+
+@register('gallop')
+def gallop_plugin(instance):
+    # Galloping + binary search of max_flow_assign.py
+    return _flow_assignment(instance, 'gallop')
+
+@register('parametric')
+def parametric_plugin(instance):
+    max_load, selected, phases = parametric_max_load(*instance.arrays())
+    if max_load is None:
+        return Assignment(None, 'INFEASIBLE', stats={'phases': phases})
+    selected = np.array([selected[paper] for paper in range(1, instance.num_papers + 1)], dtype=np.int32)
+    return Assignment(max_load, 'OPTIMAL', selected.reshape(instance.num_papers, instance.reviews_per_paper),
+                      {'phases': phases})
+
+@register('MIP')
+def mip_plugin(instance, compact=False, hint=False, aggregate=False, time_limit=None):
+    value, status, times, selected = MIP.solve(*instance.arrays(), compact, hint, aggregate, time_limit)
+    return Assignment(value, status, selected, times)
+
+@register('cp')
+def cp_plugin(instance, compact=False, hint=False, aggregate=False, workers=None, time_limit=None, relative_gap=None):
+    value, status, stats, selected = cp.solve(*instance.arrays(), compact, hint, aggregate, workers, time_limit,
+                                              relative_gap)
+    return Assignment(value, status, selected, {k: v for k, v in stats.items() if k not in ('max_load', 'status')})
+
+@register('LP')
+def lp_plugin(instance, backend='auto', compact=False, seed=None, repair=False):
+    rounded, status, lp_value, times, selected = LP.solve(*instance.arrays(), backend, compact, seed, repair)
+    return Assignment(rounded, status, selected, dict(times, lp_bound=lp_value))
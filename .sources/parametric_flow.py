@@ -0,0 +1,113 @@
+import heapq
+
+from instance_io import load_bounds
+
+# Augmenting-path search shared by parametric_flow_assign.py and the LP repair in rounding.py.
+# The state is a partial assignment on 0-based ids: willing[p] lists the reviewers of paper
+# p, assigned[p] is the set of reviewers it has and papers_of[r] the set of papers reviewer r
+# has, with every reviewer at most at capacity.
+
+def greedy_fill(willing, assigned, papers_of, reviews_per_paper, capacity):
+    # Warm start: give every paper its least loaded willing reviewers that still have room
+    for paper, reviewers in enumerate(willing):
+        need = reviews_per_paper - len(assigned[paper])
+        if need <= 0:
+            continue
+        free = [r for r in reviewers if len(papers_of[r]) < capacity and r not in assigned[paper]]
+        for reviewer in heapq.nsmallest(need, free, key=lambda r: len(papers_of[r])):
+            assigned[paper].add(reviewer)
+            papers_of[reviewer].add(paper)
+
+def augment_phase(willing, assigned, papers_of, deficit_papers, capacity):
+    # One BFS forest rooted at every paper that still misses reviewers.
+    # A tree is augmented as soon as it reaches a reviewer below capacity and is then
+    # frozen for the rest of the phase, so the trees never share nodes.
+    # Returns (augmented paths, reviewers visited).
+    num_reviewers = len(papers_of)
+    parent_of_reviewer = [-1] * num_reviewers
+    parent_of_paper = {}
+    root = {}
+    dead = set()
+    queue = []
+    for paper in deficit_papers:
+        parent_of_paper[paper] = -1
+        root[paper] = paper
+        queue.append(paper)
+
+    augmented = 0
+    visited_reviewers = 0
+    for paper in queue:
+        tree = root[paper]
+        if tree in dead:
+            continue
+        for reviewer in willing[paper]:
+            if parent_of_reviewer[reviewer] != -1 or reviewer in assigned[paper]:
+                continue
+            parent_of_reviewer[reviewer] = paper
+            visited_reviewers += 1
+            if len(papers_of[reviewer]) < capacity:
+                # Flip the alternating path back to the root
+                while True:
+                    p = parent_of_reviewer[reviewer]
+                    assigned[p].add(reviewer)
+                    papers_of[reviewer].add(p)
+                    previous = parent_of_paper[p]
+                    if previous == -1:
+                        break
+                    assigned[p].discard(previous)
+                    papers_of[previous].discard(p)
+                    reviewer = previous
+                dead.add(tree)
+                augmented += 1
+                break
+            for next_paper in papers_of[reviewer]:
+                if next_paper not in parent_of_paper:
+                    parent_of_paper[next_paper] = reviewer
+                    root[next_paper] = tree
+                    queue.append(next_paper)
+
+    return augmented, visited_reviewers
+
+def next_capacity(capacity, assigned, deficit_papers, reviews_per_paper, visited_reviewers):
+    # Called after a phase without augmenting path: every reachable reviewer is full and only
+    # takes papers from the reachable side, so the missing reviews must be spread over those
+    # reviewers and no capacity below the returned one can be feasible.
+    deficit = sum(reviews_per_paper - len(assigned[p]) for p in deficit_papers)
+    return capacity + (deficit + visited_reviewers - 1) // visited_reviewers
+
+def parametric_max_load(num_papers, num_reviewers, reviews_per_paper, indptr, indices):
+    # Never restarts the flow, but every phase is a Python BFS: on 100k x 10k x 3 instances of
+    # degree 20 it takes 3-50 s where the OR-Tools gallop of flow_network.search_max_load
+    # takes 0.3-3 s. It only catches up when the optimum is far above the lower bound (Zipf
+    # s=1.5: 13 s for both, 290 s for the +1 scan)
+    # 0-based Python lists, the BFS below is pointer chasing and faster on lists than arrays
+    flat = (indices - 1).tolist()
+    bounds = indptr.tolist()
+    willing = [flat[bounds[paper]:bounds[paper + 1]] for paper in range(num_papers)]
+    assigned = [set() for _ in range(num_papers)]
+    papers_of = [set() for _ in range(num_reviewers)]
+
+    # Start at the Dirichlet bound, above the max reviewer degree the reviewer->sink arcs
+    # no longer bind
+    capacity, high = load_bounds(num_papers, num_reviewers, reviews_per_paper, indices)
+    greedy_fill(willing, assigned, papers_of, reviews_per_paper, capacity)
+
+    phases = 0
+    while True:
+        deficit_papers = [p for p in range(num_papers) if len(assigned[p]) < reviews_per_paper]
+        if not deficit_papers:
+            break
+        phases += 1
+        augmented, visited_reviewers = augment_phase(willing, assigned, papers_of, deficit_papers, capacity)
+        if augmented:
+            continue
+        if visited_reviewers == 0 or capacity >= high:
+            # Not even unbounded reviewer capacities can cover every paper
+            return None, None, phases
+        capacity = next_capacity(capacity, assigned, deficit_papers, reviews_per_paper, visited_reviewers)
+        greedy_fill(willing, assigned, papers_of, reviews_per_paper, capacity)
+
+    selected_reviewers = {}
+    for paper in range(num_papers):
+        selected_reviewers[paper + 1] = [r + 1 for r in willing[paper] if r in assigned[paper]]
+    return capacity, selected_reviewers, phases
@@ -0,0 +1,97 @@
+import numpy as np
+
+from instance_io import load_bounds
+from parametric_flow import augment_phase, next_capacity
+
+# Rounding of the LP relaxation of LP.py. The fractional x of a paper sums to K and every
+# entry is at most 1, so systematic sampling picks exactly K distinct reviewers with
+# P(reviewer picked) == x: the paper's reviewers are laid end to end on [0, K) in a random
+# order, each covering an interval of length x, and the ones covering u, u+1, ..., u+K-1
+# for a single uniform u are picked. All papers are rounded at once on the CSR arrays.
+#
+# The rounded assignment ignores the load bound, repair_assignment then brings every
+# reviewer back under a capacity with augmenting paths. The LP optimum rounded up is the
+# integer optimum (the flow polytope at an integer capacity is integral), so repairing to
+# ceil(LP) gives an optimal assignment that keeps as much of the rounding as it can.
+
+def _capped_rows(values, paper_of_edge, degrees, reviews_per_paper):
+    # Scales every row to sum K with no entry above 1 (the LP rows only hold up to the solver
+    # tolerance): entries pushed to 1 stay there and the rest of the row makes up for them,
+    # each round caps at least one more entry. Papers without any mass are spread evenly.
+    num_papers = len(degrees)
+    values = np.clip(np.asarray(values, dtype=np.float64), 0.0, 1.0)
+    empty = np.bincount(paper_of_edge, weights=values, minlength=num_papers) <= 0
+    values = np.where(empty[paper_of_edge], reviews_per_paper / np.maximum(degrees, 1)[paper_of_edge], values)
+    while True:
+        full = values >= 1.0
+        free = np.bincount(paper_of_edge, weights=np.where(full, 0.0, values), minlength=num_papers)
+        need = reviews_per_paper - np.bincount(paper_of_edge, weights=full, minlength=num_papers)
+        scale = np.where(free > 0, need / np.where(free > 0, free, 1.0), 1.0)
+        values = np.where(full, 1.0, values * scale[paper_of_edge])
+        if (values <= 1.0).all():
+            return values
+        values = np.minimum(values, 1.0)
+
+def dependent_rounding(indptr, values, reviews_per_paper, rng):
+    # Returns a bool mask over the CSR edges with exactly min(K, degree) picks per paper
+    num_papers = len(indptr) - 1
+    degrees = np.diff(indptr)
+    paper_of_edge = np.repeat(np.arange(num_papers), degrees)
+    values = _capped_rows(values, paper_of_edge, degrees, reviews_per_paper)
+
+    # Random order of the reviewers inside every paper
+    order = np.argsort(paper_of_edge + rng.random(len(values)), kind='stable')
+    ends = np.cumsum(values[order])
+    bases = np.concatenate(([0.0], ends))[indptr[:-1]]
+    ends -= bases[paper_of_edge]
+    starts = ends - values[order]
+    offsets = rng.random(num_papers)[paper_of_edge]
+    chosen = np.zeros(len(values), dtype=bool)
+    chosen[order] = np.floor(ends - offsets) > np.floor(starts - offsets)
+
+    # Float noise in the row sums can still move a sample point across a row end: those
+    # (rare) papers keep their picks first, then their largest values, up to K
+    counts = np.bincount(paper_of_edge[chosen], minlength=num_papers)
+    for paper in np.flatnonzero(counts != np.minimum(degrees, reviews_per_paper)).tolist():
+        lo, hi = indptr[paper], indptr[paper + 1]
+        keep = np.lexsort((-values[lo:hi], ~chosen[lo:hi]))[:reviews_per_paper]
+        chosen[lo:hi] = False
+        chosen[lo + keep] = True
+    return chosen
+
+def repair_assignment(num_reviewers, reviews_per_paper, indptr, indices, chosen, capacity):
+    # Drops the papers above capacity of every overloaded reviewer, then refills the papers
+    # short of K reviewers with alternating paths (one BFS forest per phase, see
+    # parametric_flow). The capacity goes up only when no path is left. Returns (chosen mask, capacity), or (None, capacity)
+    # when some paper cannot get K reviewers at all.
+    num_papers = len(indptr) - 1
+    _, high = load_bounds(num_papers, num_reviewers, reviews_per_paper, indices)
+    flat = (indices - 1).tolist()
+    bounds = indptr.tolist()
+    willing = [flat[bounds[paper]:bounds[paper + 1]] for paper in range(num_papers)]
+    assigned = [set() for _ in range(num_papers)]
+    papers_of = [set() for _ in range(num_reviewers)]
+    paper_of_edge = np.repeat(np.arange(num_papers), np.diff(indptr))
+    for paper, reviewer in zip(paper_of_edge[chosen].tolist(), (indices[chosen] - 1).tolist()):
+        assigned[paper].add(reviewer)
+        papers_of[reviewer].add(paper)
+    for reviewer, papers in enumerate(papers_of):
+        while len(papers) > capacity:
+            assigned[papers.pop()].discard(reviewer)
+    for paper in range(num_papers):
+        while len(assigned[paper]) > reviews_per_paper:
+            papers_of[assigned[paper].pop()].discard(paper)
+
+    while True:
+        deficit_papers = [p for p in range(num_papers) if len(assigned[p]) < reviews_per_paper]
+        if not deficit_papers:
+            break
+        augmented, visited_reviewers = augment_phase(willing, assigned, papers_of, deficit_papers, capacity)
+        if augmented:
+            continue
+        if visited_reviewers == 0 or capacity >= high:
+            return None, capacity
+        capacity = next_capacity(capacity, assigned, deficit_papers, reviews_per_paper, visited_reviewers)
+
+    selected = np.array([reviewer in assigned[paper] for paper, reviewer in zip(paper_of_edge.tolist(), flat)], dtype=bool)
+    return selected, capacity
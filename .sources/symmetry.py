@@ -0,0 +1,92 @@
+import numpy as np
+
+from instance_io import transpose
+
+# Papers with the same set of willing reviewers, and reviewers willing to review the same
+# set of papers, are interchangeable: every model has a huge number of symmetric optima.
+# Grouping them into classes gives an aggregated model with one integer count per
+# (paper class, reviewer class) pair: how many reviews the papers of the class get from
+# the reviewers of the class. The aggregation is exact, expand_assignment turns any
+# aggregated solution back into per-paper reviewer lists with the same max load:
+#   - a paper class of m papers deals its m*K reviews round-robin over its papers, so each
+#     paper gets K, at most ceil(count/m) <= min(size, K) from each reviewer class
+#   - a reviewer class of s reviewers deals the reviews it got round-robin over its
+#     reviewers, the copies of one paper being consecutive, so each paper gets distinct
+#     reviewers and every load is at most ceil(total/s) <= max_load
+
+class Aggregation:
+    def __init__(self, num_papers, num_reviewers, indptr, indices):
+        self.num_papers = num_papers
+        self.num_reviewers = num_reviewers
+        self.paper_class, self.paper_sizes = row_classes(indptr, indices)
+        rev_indptr, rev_indices = transpose(num_reviewers, indptr, indices)
+        self.reviewer_class, self.reviewer_sizes = row_classes(rev_indptr, rev_indices)
+        self.paper_members = class_members(self.paper_class, len(self.paper_sizes))
+        # 1-based reviewer ids
+        self.reviewer_members = [[r + 1 for r in members]
+                                 for members in class_members(self.reviewer_class, len(self.reviewer_sizes))]
+
+        # Class graph in CSR form: the reviewer classes of paper class q are
+        # class_indices[class_indptr[q]:class_indptr[q+1]], taken from one representative paper
+        flat = indices.tolist()
+        bounds = indptr.tolist()
+        reviewer_class = self.reviewer_class.tolist()
+        rows = [sorted({reviewer_class[r - 1] for r in flat[bounds[members[0]]:bounds[members[0] + 1]]})
+                for members in self.paper_members]
+        self.class_indptr = np.zeros(len(rows) + 1, dtype=np.int32)
+        np.cumsum([len(row) for row in rows], out=self.class_indptr[1:])
+        self.class_indices = np.array([c for row in rows for c in row], dtype=np.int32)
+
+    def num_classes(self):
+        return len(self.paper_sizes), len(self.reviewer_sizes)
+
+def row_classes(indptr, indices):
+    # Groups the CSR rows with the same set of entries. Returns (class_of_row, class_sizes),
+    # classes numbered in order of their first row
+    row_of_entry = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    flat = indices[np.lexsort((indices, row_of_entry))].tolist()
+    bounds = indptr.tolist()
+    classes = {}
+    class_of_row = np.array([classes.setdefault(tuple(flat[bounds[row]:bounds[row + 1]]), len(classes))
+                             for row in range(len(bounds) - 1)], dtype=np.int32)
+    return class_of_row, np.bincount(class_of_row, minlength=len(classes))
+
+def class_members(class_of_row, num_classes):
+    order = np.argsort(class_of_row, kind='stable')
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(class_of_row, minlength=num_classes)))).tolist()
+    order = order.tolist()
+    return [order[bounds[c]:bounds[c + 1]] for c in range(num_classes)]
+
+def class_counts(aggregation, indptr, indices, chosen):
+    # Aggregated counts of an assignment given as a bool mask over the CSR edges, one per
+    # class graph edge (used to hint the aggregated models)
+    num_reviewer_classes = len(aggregation.reviewer_sizes)
+    paper_of_edge = np.repeat(np.arange(aggregation.num_papers), np.diff(indptr))
+    keys = (aggregation.paper_class[paper_of_edge[chosen]].astype(np.int64) * num_reviewer_classes
+            + aggregation.reviewer_class[indices[chosen] - 1])
+    # Class graph edges are sorted by (paper class, reviewer class), so their keys are too
+    class_keys = (np.repeat(np.arange(len(aggregation.paper_sizes), dtype=np.int64), np.diff(aggregation.class_indptr))
+                  * num_reviewer_classes + aggregation.class_indices)
+    return np.bincount(np.searchsorted(class_keys, keys), minlength=len(class_keys))
+
+def expand_assignment(aggregation, counts, reviews_per_paper):
+    # counts[e] for every class graph edge e. Returns the (num_papers, K) array of 1-based reviewers
+    num_reviewer_classes = len(aggregation.reviewer_sizes)
+    bounds = aggregation.class_indptr.tolist()
+    targets = aggregation.class_indices.tolist()
+    received = [[] for _ in range(num_reviewer_classes)]
+    for q, papers in enumerate(aggregation.paper_members):
+        m = len(papers)
+        i = 0
+        for e in range(bounds[q], bounds[q + 1]):
+            for _ in range(int(counts[e])):
+                received[targets[e]].append(papers[i % m])
+                i += 1
+
+    selected = [[] for _ in range(aggregation.num_papers)]
+    for c, papers in enumerate(received):
+        reviewers = aggregation.reviewer_members[c]
+        # Sorting puts the copies of a paper next to each other
+        for j, paper in enumerate(sorted(papers)):
+            selected[paper].append(reviewers[j % len(reviewers)])
+    return np.array(selected, dtype=np.int32).reshape(aggregation.num_papers, reviews_per_paper)
@@ -0,0 +1,58 @@
+import numpy as np
+
+from greedy import greedy_assign
+from local_search import SearchState, local_search
+
+# Warm start for the exact models: a greedy + local search assignment (a few milliseconds
+# to a second, usually at or next to the optimum) is handed to the solver as a hint, and
+# its max load becomes an upper bound on the objective.
+
+def heuristic_assignment(num_reviewers, reviews_per_paper, indptr, indices, time_limit=None, chain_depth=4):
+    # Returns (max_load, chosen) with chosen a bool mask over the edges in CSR order,
+    # or (None, None) when the greedy could not give every paper K reviewers
+    num_papers = len(indptr) - 1
+    _, selected = greedy_assign(num_reviewers, reviews_per_paper, indptr, indices)
+    if num_papers and selected.min() == 0:
+        return None, None
+    state = SearchState(num_reviewers, indptr, indices, selected)
+    local_search(state, time_limit, chain_depth=chain_depth)
+    selected = np.array(state.selected(reviews_per_paper), dtype=np.int32).reshape(num_papers, reviews_per_paper)
+    paper_of_edge = np.repeat(np.arange(num_papers), np.diff(indptr))
+    chosen = (selected[paper_of_edge] == indices[:, None]).any(axis=1)
+    # The bound on the objective comes from the hint itself, a wrong search bookkeeping could
+    # otherwise cut off every solution
+    return max(hint_loads(num_reviewers, indices, chosen)[1:], default=0), chosen
+
+def hint_loads(num_reviewers, indices, chosen):
+    return np.bincount(indices[chosen], minlength=num_reviewers + 1).tolist()
+
+def hint_cp_model(model, num_reviewers, indices, x, loads, max_load, value, chosen):
+    for variable, hint in zip(x, chosen.tolist()):
+        model.AddHint(variable, hint)
+    if loads is not None:
+        for load, hint in zip(loads[1:], hint_loads(num_reviewers, indices, chosen)[1:]):
+            model.AddHint(load, hint)
+    model.AddHint(max_load, value)
+    model.Add(max_load <= value)
+
+def hint_linear_model(solver, num_reviewers, indices, x, loads, max_load, value, chosen):
+    # pywraplp takes all the hints in one SetHint call
+    variables = list(x)
+    values = chosen.astype(float).tolist()
+    if loads is not None:
+        variables += loads[1:]
+        values += [float(v) for v in hint_loads(num_reviewers, indices, chosen)[1:]]
+    variables.append(max_load)
+    values.append(float(value))
+    solver.SetHint(variables, values)
+    max_load.SetUb(min(max_load.ub(), value))
+
+def hint_aggregated_cp_model(model, y, max_load, value, counts):
+    for variable, hint in zip(y, counts.tolist()):
+        model.AddHint(variable, hint)
+    model.AddHint(max_load, value)
+    model.Add(max_load <= value)
+
+def hint_aggregated_linear_model(solver, y, max_load, value, counts):
+    solver.SetHint(list(y) + [max_load], [float(v) for v in counts.tolist()] + [float(value)])
+    max_load.SetUb(min(max_load.ub(), value))
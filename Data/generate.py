@@ -1,18 +1,12 @@
-import random
+import os
+import sys
 
-def generate_test_case():
-    P = 1333# Số papers
-    R = 41 # Số reviewers
-    K = 5   # Số reviewers mỗi paper cần
-    
+# The generator lives in .sources/generate.py, this entry point only forwards its command line
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.sources'))
+from generate import main
 
-    with open('input.txt', 'w') as f:
-        # Dòng đầu: P R K
-        f.write(f"{P} {R} {K}\n")
-        # Mỗi paper chọn ngẫu nhiên 5 reviewers từ R reviewers
-        for paper in range(1, P + 1):
-            nums=random.randint(int(0.2*R),int(0.7*R) )
-            reviewers= random.sample(range(1, R+1),nums )
-            f.write(f"{nums} {' '.join(map(str, reviewers))}\n")
 if __name__ == "__main__":
-    generate_test_case()
\ No newline at end of file
+    # This script always wrote the 1333x41x5 instance, kept as its default. Flags given on the
+    # command line come later and win
+    sys.argv[1:1] = ['-P', '1333', '-R', '41', '-K', '5']
+    main()
@@ -0,0 +1,37 @@
+import argparse
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '.sources'))
+from instance_io import read_instance_stdin
+from parametric_flow import parametric_max_load
+
+def input_data():
+    # Same instance format as max_flow_assign.py, read from stdin in one go
+    return read_instance_stdin()
+
+def print_assignment(num_papers, reviews_per_paper, selected_reviewers):
+    lines = [str(num_papers)]
+    for paper in range(1, num_papers + 1):
+        lines.append(f"{reviews_per_paper} {' '.join(map(str, selected_reviewers[paper]))}")
+    sys.stdout.write('\n'.join(lines) + '\n')
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Minimum maximum load assignment in a single parametric max-flow pass (input on stdin).")
+    parser.add_argument('--stats', action='store_true',
+                        help="report the optimal max_load and the number of augmentation phases on stderr")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    num_papers, num_reviewers, reviews_per_paper, indptr, indices = input_data()
+
+    max_load, selected_reviewers, phases = parametric_max_load(num_papers, num_reviewers, reviews_per_paper, indptr, indices)
+    if args.stats:
+        print(f"max_load: {max_load} phases: {phases}", file=sys.stderr)
+    if selected_reviewers is None:
+        print("Matching is not possible")
+        return
+    print_assignment(num_papers, reviews_per_paper, selected_reviewers)
+
+if __name__ == "__main__":
+    main()